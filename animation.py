@@ -0,0 +1,64 @@
+import pygame
+import texture_pack
+from memory import memory
+
+FRAME_WIDTH = 100
+FRAME_HEIGHT = 100
+
+
+class AnimationAtlas:
+    """Process-wide cache of sliced, scaled and flipped animation frames.
+
+    Frames are keyed by (sheet, scale, facing) and built only once, so every
+    Player/Enemy using the same sheet shares the same frame surfaces. A sheet
+    can be given as a file path; frames then come from the baked texture pack
+    when it has them, otherwise the sheet is loaded on first use.
+    """
+    def __init__(self):
+        self._frames = {}
+        self._sheets = {}
+
+    def sheet(self, path):
+        """Sprite sheet at `path`, loaded once and converted to the display format."""
+        sheet = self._sheets.get(path)
+        if sheet is None:
+            sheet = pygame.image.load(path)
+            # converting needs a display; sheets loaded before it stay as decoded
+            if pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha()
+            self._sheets[path] = memory.track(sheet, "characters")
+        return sheet
+
+    def get(self, sheet, scale, flipped=False):
+        """Return the frame list for a sheet at the given scale and facing."""
+        key = (sheet, scale, flipped)
+        frames = self._frames.get(key)
+        if frames is None:
+            if isinstance(sheet, str):
+                frames = texture_pack.frames(sheet, scale, flipped)
+            if frames is None and flipped:
+                frames = [pygame.transform.flip(f, True, False) for f in self.get(sheet, scale)]
+            elif frames is None:
+                frames = self._slice(self.sheet(sheet) if isinstance(sheet, str) else sheet, scale)
+            self._frames[key] = memory.track_all(frames, "characters")
+        return frames
+
+    def _slice(self, sheet, scale):
+        """Cut a horizontal sprite sheet into frames and scale each one.
+        Frames keep the sheet's pixel format, so converted sheets give
+        frames that blit without conversion."""
+        frames = []
+        size = (int(FRAME_WIDTH * scale), int(FRAME_HEIGHT * scale))
+        num_frames = sheet.get_width() // FRAME_WIDTH
+        for i in range(num_frames):
+            frame = sheet.subsurface((i * FRAME_WIDTH, 0, FRAME_WIDTH, FRAME_HEIGHT))
+            frames.append(pygame.transform.scale(frame, size))
+        return frames
+
+    def clear(self):
+        self._frames.clear()
+        self._sheets.clear()
+
+
+# shared by every character in the game
+atlas = AnimationAtlas()
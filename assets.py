@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from settings import *
+from memory import memory, surface_bytes
+import texture_pack
+
+
+def load_scaled_image(path, height):
+    """Decode an image and smoothscale it to `height`, keeping its aspect ratio."""
+    img = pygame.image.load(path).convert_alpha()
+    scale = height / img.get_height()
+    return pygame.transform.smoothscale(img, (int(img.get_width() * scale), height))
+
+
+def load_image(path, height):
+    """Baked image from the texture pack, or decode and scale the file."""
+    img = texture_pack.image(path, height)
+    return img if img is not None else load_scaled_image(path, height)
+
+
+class AssetCache:
+    """Process-wide LRU cache of decoded and scaled images.
+
+    Entries survive across Level instances; the least recently used ones are
+    dropped once the cache goes over its byte budget. prefetch() decodes on a
+    background thread so the image is ready by the time it is asked for.
+    """
+    def __init__(self, budget_bytes, tag="backgrounds"):
+        self.budget_bytes = budget_bytes
+        self.tag = tag  # memory accounting tag of the cached images
+        self.bytes = 0
+        self._items = OrderedDict()  # key -> (surface or None, nbytes)
+        self._pending = {}  # key -> Future
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-prefetch")
+
+    def get(self, key, loader):
+        """Cached value for key, calling loader() on a miss. Failed loads cache None."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key][0]
+            future = self._pending.get(key)
+        if future is not None:
+            return self._finish(key, future)
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"Failed to load {key[0] if isinstance(key, tuple) else key}:", e)
+            value = None
+        self._store(key, value)
+        return value
+
+    def prefetch(self, key, loader):
+        """Start loading key on the background thread if it is not cached yet."""
+        with self._lock:
+            if key in self._items or key in self._pending:
+                return
+            self._pending[key] = self._executor.submit(loader)
+
+    def _finish(self, key, future):
+        try:
+            value = future.result()
+        except Exception as e:
+            print(f"Failed to load {key[0] if isinstance(key, tuple) else key}:", e)
+            value = None
+        with self._lock:
+            self._pending.pop(key, None)
+        self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        nbytes = surface_bytes(value) if isinstance(value, pygame.Surface) else 0
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = (value, nbytes)
+            self.bytes += nbytes
+            # evict least recently used, never the entry just added
+            while self.bytes > self.budget_bytes and len(self._items) > 1:
+                _, (_, old_bytes) = self._items.popitem(last=False)
+                self.bytes -= old_bytes
+        if value is not None:
+            memory.track(value, self.tag, nbytes)
+
+    def shrink(self, nbytes):
+        """Drop least recently used entries until nbytes are freed (the newest stays)."""
+        with self._lock:
+            freed = 0
+            while freed < nbytes and len(self._items) > 1:
+                _, (_, old_bytes) = self._items.popitem(last=False)
+                self.bytes -= old_bytes
+                freed += old_bytes
+
+    def image(self, path, height):
+        """Image at `path` scaled to `height` (None if it cannot be loaded)."""
+        return self.get((path, height), lambda: load_image(path, height))
+
+    def prefetch_image(self, path, height):
+        self.prefetch((path, height), lambda: load_image(path, height))
+
+    def clear(self):
+        """Forget every entry, including prefetches still in flight."""
+        with self._lock:
+            self._items.clear()
+            self._pending.clear()
+            self.bytes = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+# shared by every Level
+asset_cache = AssetCache(ASSET_CACHE_BUDGET_MB * 1024 * 1024)
+memory.set_evictor("backgrounds", asset_cache.shrink)
@@ -0,0 +1,94 @@
+import pygame
+from settings import *
+from utils import load_sound
+from memory import memory
+import game_clock
+
+
+class SoundSpec:
+    """How a named sound is played."""
+    def __init__(self, path, volume=1.0, max_voices=2, priority=0, cooldown_ms=0):
+        self.path = path
+        self.volume = volume
+        self.max_voices = max_voices
+        self.priority = priority
+        self.cooldown_ms = cooldown_ms
+
+
+class SoundBank:
+    """Decodes each sound file once and plays it through a managed channel pool.
+
+    Every sound has a voice limit, a priority and a cooldown: extra plays of a
+    sound that is already at its limit or still cooling down are dropped, and
+    when all channels are busy a lower-priority voice is cut off.
+    """
+    def __init__(self, channels=SOUND_CHANNELS):
+        self.channels = channels
+        self._specs = {}
+        self._sounds = {}   # path -> decoded Sound, shared by every user
+        self._voices = {}   # Channel -> (name, priority, started)
+        self._last_play = {}
+        self._pool_ready = False
+
+    def register(self, name, path, volume=1.0, max_voices=2, priority=0, cooldown_ms=0):
+        self._specs[name] = SoundSpec(path, volume, max_voices, priority, cooldown_ms)
+
+    def sound(self, name):
+        """The shared Sound for a registered name, decoded on first use."""
+        spec = self._specs[name]
+        sound = self._sounds.get(spec.path)
+        if sound is None:
+            sound = self._sounds[spec.path] = memory.track(load_sound(spec.path, spec.volume), "audio")
+        return sound
+
+    def _channels_for(self, name):
+        # forget voices that finished
+        for channel in [c for c in self._voices if not c.get_busy()]:
+            del self._voices[channel]
+        return [c for c, (n, _, _) in self._voices.items() if n == name]
+
+    def _free_channel(self, priority):
+        channel = pygame.mixer.find_channel(False)
+        if channel is not None:
+            return channel
+        # steal the oldest voice with the lowest priority below ours
+        victims = [(p, started, c) for c, (_, p, started) in self._voices.items() if p < priority]
+        if not victims:
+            return None
+        _, _, channel = min(victims, key=lambda v: (v[0], v[1]))
+        channel.stop()
+        del self._voices[channel]
+        return channel
+
+    def play(self, name):
+        """Play a registered sound; returns the Channel or None if it was dropped."""
+        if not pygame.mixer.get_init():
+            return None
+        if not self._pool_ready:
+            pygame.mixer.set_num_channels(self.channels)
+            self._pool_ready = True
+        spec = self._specs[name]
+        now = game_clock.get_ticks()
+        last = self._last_play.get(name)
+        # game time goes back on a rewind, so a play "in the future" does not count
+        if last is not None and 0 <= now - last < spec.cooldown_ms:
+            return None
+        if len(self._channels_for(name)) >= spec.max_voices:
+            return None
+        channel = self._free_channel(spec.priority)
+        if channel is None:
+            return None
+        channel.play(self.sound(name))
+        self._voices[channel] = (name, spec.priority, now)
+        self._last_play[name] = now
+        return channel
+
+    def stop_all(self):
+        for channel in self._voices:
+            channel.stop()
+        self._voices.clear()
+
+
+sound_bank = SoundBank()
+sound_bank.register("player_hit", "Audio/player_hit1.mp3", volume=0.3, max_voices=2, priority=2, cooldown_ms=100)
+sound_bank.register("orc_death", "Audio/orc_death.MP3", volume=0.6, max_voices=4, priority=1, cooldown_ms=150)
@@ -0,0 +1,215 @@
+"""Balance sweeps: play every level headless for each combination of a
+parameter grid and a player policy, on all cores, and tabulate the results.
+
+    python balance.py --grid ENEMY_SPEED=3,4,5 PLAYER_ATTACK_DAMAGE=1,2
+    python balance.py --grid attack_range=50,70,90 --policies chase --levels 1 2
+
+Tunable parameters: ENEMY_SPEED, ENEMY_ATTACK_DAMAGE, ENEMY_HEALTH,
+attack_range and vision_range (per orc), PLAYER_ATTACK_DAMAGE and
+PLAYER_HEALTH. Unlisted parameters keep their settings.py values.
+Every run is deterministic, so one run per combination is enough.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# let the pool stop its workers; SDL would otherwise swallow SIGTERM
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import pygame
+from settings import *
+from level_format import level_numbers
+from replay import InputState, _KEY_BITS
+
+DEFAULT_OUTPUT = "balance_results.json"
+
+# grid name -> EnemyManager.spawn() argument
+ENEMY_PARAMS = {
+    "ENEMY_SPEED": "speed",
+    "ENEMY_ATTACK_DAMAGE": "attack_damage",
+    "ENEMY_HEALTH": "health",
+    "attack_range": "attack_range",
+    "vision_range": "vision_range",
+}
+PLAYER_PARAMS = ("PLAYER_ATTACK_DAMAGE", "PLAYER_HEALTH")
+REACH = 80  # how close (body centre to orc centre) the policies swing from
+
+
+def _keys(*keys):
+    mask = 0
+    for key in keys:
+        mask |= _KEY_BITS[key]
+    return InputState(mask)
+
+
+# ----------------------------------------------------------------------
+# Player policies: game -> held keys for this tick
+def nearest_orc_dx(game):
+    """x distance from the player's body to the closest living orc, or None."""
+    enemies = game.enemies
+    if not enemies.any_alive():
+        return None
+    body_x = game.player.get_body_rect().centerx
+    centers = enemies.pos[:, 0] + enemies.half[:, 0]
+    dx = centers[enemies.alive] - body_x
+    return float(dx[abs(dx).argmin()])
+
+
+def chase(game):
+    """Walk to the nearest orc, face it and swing; head for the exit once all are dead."""
+    dx = nearest_orc_dx(game)
+    if dx is None:
+        return _keys(pygame.K_d)
+    toward = pygame.K_a if dx < 0 else pygame.K_d
+    if abs(dx) > REACH or game.player.side_left != (dx < 0):
+        return _keys(toward)
+    return _keys(pygame.K_SPACE)
+
+
+def rush(game):
+    """Run right, swinging every other half second, no aiming."""
+    if (game.sim_clock.get_ticks() // 500) % 2:
+        return _keys(pygame.K_SPACE)
+    return _keys(pygame.K_d)
+
+
+POLICIES = {"chase": chase, "rush": rush}
+
+
+class PolicyInput:
+    """Input source that asks a policy for the keys every tick."""
+    def __init__(self, policy):
+        self.policy = policy
+        self.game = None
+        self.keys = InputState()
+        self.events = []
+        self.finished = False
+
+    def poll(self):
+        if self.game is not None and self.game.player is not None:
+            self.keys = self.policy(self.game)
+
+
+# ----------------------------------------------------------------------
+def play(job):
+    """One headless playthrough; runs in a worker process."""
+    from main import Game
+    level, policy, params, max_ticks = job
+    source = PolicyInput(POLICIES[policy])
+    game = Game(headless=True, seed=0, input_source=source)
+    source.game = game
+    game.enemy_stats = {ENEMY_PARAMS[k]: v for k, v in params.items() if k in ENEMY_PARAMS}
+    game.play_level(level)
+    player = game.player
+    if "PLAYER_ATTACK_DAMAGE" in params:
+        player.attack_damage = params["PLAYER_ATTACK_DAMAGE"]
+    if "PLAYER_HEALTH" in params:
+        player.health = player.max_health = params["PLAYER_HEALTH"]
+    start_health = player.health
+
+    ticks = 0
+    while game.state == "playing" and ticks < max_ticks:
+        game.step()
+        ticks += 1
+
+    won = game.state == "level_complete"
+    return {
+        "level": level,
+        "policy": policy,
+        "params": params,
+        "won": won,
+        "ticks": ticks,
+        "time_to_clear_s": ticks * TICK_MS / 1000 if won else None,
+        "damage_taken": start_health - player.health,
+        "kills": len(game.level.enemy_spawns) - int(game.enemies.alive.sum()),
+        "outcome": "win" if won else "death" if game.state == "game_over" else "timeout",
+    }
+
+
+def parse_grid(specs):
+    """["NAME=1,2,3", ...] -> {"NAME": [1, 2, 3], ...}"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in ENEMY_PARAMS and name not in PLAYER_PARAMS:
+            raise SystemExit(f"unknown parameter {name!r}")
+        grid[name] = [float(v) if "." in v else int(v) for v in values.split(",")]
+    return grid
+
+
+def combinations(grid):
+    names = list(grid)
+    for values in itertools.product(*(grid[n] for n in names)):
+        yield dict(zip(names, values))
+
+
+def summarize(runs):
+    """Aggregate rows per (parameters, policy) over all levels."""
+    groups = {}
+    for run in runs:
+        key = (json.dumps(run["params"], sort_keys=True), run["policy"])
+        groups.setdefault(key, []).append(run)
+    rows = []
+    for (params, policy), group in sorted(groups.items()):
+        clears = [r["time_to_clear_s"] for r in group if r["won"]]
+        rows.append({
+            "params": json.loads(params),
+            "policy": policy,
+            "runs": len(group),
+            "win_rate": len(clears) / len(group),
+            "mean_time_to_clear_s": statistics.fmean(clears) if clears else None,
+            "mean_damage_taken": statistics.fmean(r["damage_taken"] for r in group),
+            "deaths": sum(r["outcome"] == "death" for r in group),
+            "timeouts": sum(r["outcome"] == "timeout" for r in group),
+        })
+    return rows
+
+
+def print_table(rows):
+    labels = [" ".join(f"{k}={v}" for k, v in row["params"].items()) or "(defaults)" for row in rows]
+    width = max(len(label) for label in labels)
+    print(f"{'params':<{width}}  policy  win%   clear s  damage  deaths  timeouts")
+    for label, row in zip(labels, rows):
+        clear = f"{row['mean_time_to_clear_s']:7.1f}" if row["mean_time_to_clear_s"] is not None else "      -"
+        print(f"{label:<{width}}  {row['policy']:<6}  {row['win_rate'] * 100:4.0f}  {clear}  "
+              f"{row['mean_damage_taken']:6.1f}  {row['deaths']:6}  {row['timeouts']:8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid", nargs="*", default=[], metavar="NAME=V1,V2")
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument("--levels", type=int, nargs="+", default=level_numbers())
+    parser.add_argument("--max-seconds", type=float, default=90, help="game time before a run counts as a timeout")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    max_ticks = int(args.max_seconds * FPS)
+    jobs = [(level, policy, params, max_ticks)
+            for params in combinations(parse_grid(args.grid))
+            for policy in args.policies
+            for level in args.levels]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.jobs) as pool:
+        runs = list(pool.imap_unordered(play, jobs))
+    wall = time.perf_counter() - start
+
+    rows = summarize(runs)
+    with open(args.output, "w") as f:
+        json.dump({"runs": runs, "summary": rows}, f, indent=2)
+    print_table(rows)
+    print(f"{len(runs)} runs on {args.jobs} processes in {wall:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
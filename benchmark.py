@@ -0,0 +1,217 @@
+"""Benchmarks for the level load, update and draw hot paths.
+
+Runs headless (dummy SDL video driver) and writes machine-readable JSON:
+
+    python benchmark.py                          # run, print table, write bench_results.json
+    python benchmark.py --save-baseline          # also store the results as the baseline
+    python benchmark.py --baseline bench_baseline.json --threshold 0.2
+
+With a baseline, scenarios that got slower than the threshold are listed and
+the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform as host
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from settings import *
+from level_format import compile_level, level_numbers
+
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+
+
+def measure(fn, repeat, setup=None):
+    """Time fn() `repeat` times, returns per-call milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def populate(game, enemies, platforms, seed=0):
+    """Add extra orcs and platforms to the game's current level."""
+    rng = random.Random(seed)
+    for _ in range(platforms):
+        game.level.add_platform(rng.randrange(0, game.level.world_width - 200), rng.randrange(200, game.level.ground_y - 40),
+                                rng.randrange(80, 250), 20)
+    for _ in range(enemies):
+        game.enemies.spawn(rng.randrange(0, game.level.world_width - 300), game.level.ground_y - ENEMY_HEIGHT - 100)
+
+
+def wide_level(width, seed=0):
+    """Compile a generated level `width` px wide, with a platform every 350 px
+    and an orc every 2000 px; returns the binary's path."""
+    rng = random.Random(seed)
+    data = {
+        "world_width": width,
+        "backgrounds": [],
+        "platforms": [[x, rng.randrange(300, 560), rng.randrange(80, 250), 20] for x in range(300, width - 300, 350)],
+        "spawns": [[x, 572] for x in range(800, width, 2000)],
+    }
+    src = os.path.join(tempfile.gettempdir(), f"bench_wide_{width}.json")
+    with open(src, "w") as f:
+        json.dump(data, f)
+    dst = src[:-len(".json")] + ".lvl"
+    compile_level(src, dst)
+    return dst
+
+
+# ----------------------------------------------------------------------
+def bench_level_construct(game, repeat, level, **_):
+    """Level construction with its backgrounds already in the asset cache."""
+    from level import Level
+    return measure(lambda: Level(level_number=level), repeat)
+
+
+def bench_level_construct_cold(game, repeat, level, **_):
+    """Level construction with an empty asset cache, so the backgrounds are decoded and scaled."""
+    from level import Level
+    from assets import asset_cache
+    return measure(lambda: Level(level_number=level), repeat, setup=asset_cache.clear)
+
+
+def bench_load_level(game, repeat, level, **_):
+    return measure(lambda: game.load_level(level), repeat)
+
+
+def bench_set_state(game, repeat, enemies, **_):
+    states = ["idle", "walk", "attack", "hit", "idle"]
+    orcs = list(game.enemies)
+
+    def run():
+        for state in states:
+            game.player.set_state(state)
+            for enemy in orcs:
+                enemy.set_state(state)
+    return measure(run, repeat)
+
+
+def bench_update(game, repeat, **_):
+    return measure(game.update, repeat)
+
+
+def bench_update_wide(game, repeat, width, **_):
+    """Ticks of a wide streamed level; before each one the player is moved a
+    chunk further, so every tick streams chunks and rebuilds the navigation."""
+    from level import Level
+    game.load_level(1, Level(path=wide_level(width)))
+    physics = game.level.physics
+    row = physics.index[game.player]
+
+    def advance():
+        physics.pos[row, 0] = min(physics.pos[row, 0] + game.level.chunk_width, width - SCREEN_WIDTH)
+    return measure(game.update, repeat, setup=advance)
+
+
+def bench_draw(game, repeat, state, **_):
+    game.state = state
+    try:
+        return measure(game.draw, repeat)
+    finally:
+        game.state = "playing"
+
+
+def scenarios(levels, enemy_counts, platform_counts, widths=()):
+    """(name, bench function, params) for every parameter combination."""
+    for width in widths:
+        yield f"update_wide[width={width}]", bench_update_wide, dict(width=width)
+    for level in levels:
+        yield f"level_construct[level={level}]", bench_level_construct, dict(level=level)
+        yield f"level_construct_cold[level={level}]", bench_level_construct_cold, dict(level=level)
+        yield f"load_level[level={level}]", bench_load_level, dict(level=level)
+    for enemies in enemy_counts:
+        for platforms in platform_counts:
+            tag = f"enemies={enemies},platforms={platforms}"
+            yield f"set_state[{tag}]", bench_set_state, dict(enemies=enemies, platforms=platforms)
+            yield f"update[{tag}]", bench_update, dict(enemies=enemies, platforms=platforms)
+            for state in ("playing", "menu", "level_complete", "level_select"):
+                yield f"draw[{state},{tag}]", bench_draw, dict(enemies=enemies, platforms=platforms, state=state)
+
+
+def run_benchmarks(levels, enemy_counts, platform_counts, repeat, widths=()):
+    from main import Game
+    game = Game(headless=True)
+    results = {}
+    for name, bench, params in scenarios(levels, enemy_counts, platform_counts, widths):
+        game.play_level(params.get("level", 1))
+        populate(game, params.get("enemies", 0), params.get("platforms", 0))
+        bench(game, 2, **params)  # warm up caches
+        samples = bench(game, repeat, **params)
+        results[name] = {
+            "params": params,
+            "repeat": repeat,
+            "mean_ms": statistics.fmean(samples),
+            "median_ms": statistics.median(samples),
+            "min_ms": min(samples),
+            "max_ms": max(samples),
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Names of scenarios whose median got slower than baseline * (1 + threshold)."""
+    slower = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old and result["median_ms"] > old["median_ms"] * (1 + threshold):
+            slower.append((name, old["median_ms"], result["median_ms"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=level_numbers())
+    parser.add_argument("--enemies", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--platforms", type=int, nargs="+", default=[0, 100, 1000])
+    parser.add_argument("--widths", type=int, nargs="*", default=[400000],
+                        help="world widths of the generated streamed levels")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=None, help="compare against this results file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write {DEFAULT_BASELINE}")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.levels, args.enemies, args.platforms, args.repeat, args.widths)
+    report = {
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "machine": host.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w") as f:
+            json.dump(report, f, indent=2)
+
+    width = max(len(name) for name in results)
+    for name, r in results.items():
+        print(f"{name:<{width}}  median {r['median_ms']:8.3f} ms  min {r['min_ms']:8.3f} ms")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        slower = compare(results, baseline, args.threshold)
+        for name, old, new in slower:
+            print(f"REGRESSION {name}: {old:.3f} ms -> {new:.3f} ms")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import pygame
+from animation import atlas
+from memory import memory
+
+
+class MaskTable:
+    """Collision masks and bounding rects built once per animation frame and facing.
+
+    Lists line up with the frame lists of the animation atlas, so looking up the
+    mask of the frame a sprite is showing is just an index.
+    """
+    def __init__(self, frames_atlas):
+        self.atlas = frames_atlas
+        self._masks = {}
+        self._bounds = {}
+        self._solid = {}
+
+    def masks(self, sheet, scale, flipped=False):
+        key = (sheet, scale, flipped)
+        masks = self._masks.get(key)
+        if masks is None:
+            masks = [pygame.mask.from_surface(f) for f in self.atlas.get(sheet, scale, flipped)]
+            self._masks[key] = memory.track_all(masks, "masks")
+        return masks
+
+    def bounds(self, sheet, scale, flipped=False):
+        """Frame-local rects around the visible pixels of each frame."""
+        key = (sheet, scale, flipped)
+        bounds = self._bounds.get(key)
+        if bounds is None:
+            bounds = []
+            for mask in self.masks(sheet, scale, flipped):
+                rects = mask.get_bounding_rects()
+                if rects:
+                    bounds.append(rects[0].unionall(rects[1:]))
+                else:
+                    bounds.append(pygame.Rect(0, 0, 0, 0))
+            self._bounds[key] = bounds
+        return bounds
+
+    def body(self, sheet, scale):
+        """Frame-local box around the character over a whole animation,
+        used as its physics body."""
+        bounds = self.bounds(sheet, scale)
+        return bounds[0].unionall(bounds[1:])
+
+    def solid(self, size):
+        """Fully set mask for plain rect hitboxes."""
+        mask = self._solid.get(size)
+        if mask is None:
+            mask = pygame.mask.Mask(size, fill=True)
+            self._solid[size] = memory.track(mask, "masks")
+        return mask
+
+    def clear(self):
+        # masks cannot be weakly referenced, so they are released by hand
+        for mask in [m for masks in self._masks.values() for m in masks] + list(self._solid.values()):
+            memory.release(mask)
+        self._masks.clear()
+        self._bounds.clear()
+        self._solid.clear()
+
+
+mask_table = MaskTable(atlas)
+
+
+def rect_hits_sprite(rect, sprite):
+    """Rect broadphase, then overlap of the rect against the sprite's frame mask."""
+    if rect is None or not rect.colliderect(sprite.rect):
+        return False
+    offset = (rect.x - sprite.rect.x, rect.y - sprite.rect.y)
+    return sprite.mask.overlap(mask_table.solid(rect.size), offset) is not None
@@ -0,0 +1,93 @@
+import pygame
+from animation import FRAME_WIDTH
+from collision import rect_hits_sprite
+
+
+class AttackFrames:
+    """Frame data of one attack animation: which frames can hit and where.
+
+    The hitbox is given in unscaled frame pixels for the right-facing sheet;
+    scaled and mirrored versions are built once and cached.
+    """
+    def __init__(self, active, hitbox):
+        self.active = range(active[0], active[1] + 1)
+        self.hitbox = pygame.Rect(hitbox)
+        self._boxes = {}
+
+    def box(self, frame, scale, flipped=False):
+        """Frame-local hitbox for a frame, or None if the frame is not active."""
+        if frame not in self.active:
+            return None
+        box = self._boxes.get((scale, flipped))
+        if box is None:
+            x, y, w, h = self.hitbox
+            if flipped:
+                x = FRAME_WIDTH - x - w
+            box = pygame.Rect(x * scale, y * scale, w * scale, h * scale)
+            self._boxes[(scale, flipped)] = box
+        return box
+
+
+# attack sheets -> frame data (blade reach on the swing frames)
+ATTACKS = {
+    "Photo/Soldier/Soldier_Attack01.png": AttackFrames(active=(3, 4), hitbox=(48, 38, 33, 16)),
+    "Photo/Orc/Orc_Attack02.png": AttackFrames(active=(3, 4), hitbox=(50, 36, 26, 28)),
+}
+
+
+def hitbox(fighter):
+    """World-space hitbox of a fighter's current attack frame, or None."""
+    if fighter.state != "attack" or not fighter.alive:
+        return None
+    data = ATTACKS.get(fighter.animations["attack"])
+    if data is None:
+        return None
+    box = data.box(fighter.current_frame, fighter.scales, fighter.side_left)
+    return box.move(fighter.rect.topleft) if box is not None else None
+
+
+class Combat:
+    """Resolves every active hitbox against every hurtbox once per tick.
+
+    The level's spatial hash is the broadphase: only fighters whose sprite
+    rect overlaps a hitbox are looked at, so the cost follows who is near a
+    swing, not how many fighters the level holds. Their hurtboxes (physics
+    bodies) are tested next and the hits confirmed against the target's
+    frame mask, so only visible pixels get hit. Each swing hits a given target at most once;
+    that replaces the old global damage cooldowns.
+    """
+    def __init__(self):
+        self._hit = {}  # (attacker, swing) -> targets already hit
+
+    def snapshot(self):
+        return {key: set(hit) for key, hit in self._hit.items()}
+
+    def restore(self, snapshot):
+        self._hit = {key: set(hit) for key, hit in snapshot.items()}
+
+    def resolve(self, fighters, physics, spatial):
+        """Apply this tick's hits; returns (attacker, target) pairs. `spatial`
+        indexes the fighters by sprite rect."""
+        attackers = []
+        for fighter in fighters:
+            box = hitbox(fighter) if fighter.attacking else None
+            if box is not None:
+                attackers.append((fighter, box))
+        # forget swings that are over
+        self._hit = {key: hit for key, hit in self._hit.items() if key[0].attacking and key[0].swing == key[1]}
+        if not attackers:
+            return []
+
+        fighting = set(fighters)
+        hits = []
+        for attacker, box in attackers:
+            already = self._hit.setdefault((attacker, attacker.swing), set())
+            for target in spatial.query(box):
+                if (target in fighting and target.alive and target.team != attacker.team
+                        and target not in already and target in physics
+                        and box.colliderect(physics.box(target)) and rect_hits_sprite(box, target)):
+                    already.add(target)
+                    hits.append((attacker, target))
+        for attacker, target in hits:
+            target.take_damage(attacker.attack_damage)
+        return hits
@@ -1,17 +1,50 @@
 import pygame
 from settings import *
+from animation import atlas
+from collision import mask_table
+from audio import sound_bank
+from memory import memory
+import game_clock
 
-# Load Orc animations
+# Orc animation sheets, loaded by the atlas the first time an orc shows them
 animation_orc = {
-    "idle": pygame.image.load("Photo/Orc/Orc_Idle.png"),
-    "walk": pygame.image.load("Photo/Orc/Orc_Walk.png"),
-    "hit": pygame.image.load("Photo/Orc/Orc_Hit.png"),
-    "death": pygame.image.load("Photo/Orc/Orc_Death.png"),
-    "attack": pygame.image.load("Photo/Orc/Orc_Attack02.png")
+    "idle": "Photo/Orc/Orc_Idle.png",
+    "walk": "Photo/Orc/Orc_Walk.png",
+    "hit": "Photo/Orc/Orc_Hit.png",
+    "death": "Photo/Orc/Orc_Death.png",
+    "attack": "Photo/Orc/Orc_Attack02.png"
 }
 
+# small health bar surfaces shared by all orcs, keyed by (health, max_health)
+_health_bars = {}
+HEALTH_BAR_OFFSET = (20, 33)  # how far left of and above the sprite centre a bar starts
+
+
+def health_bar(health, max_health):
+    bar = _health_bars.get((health, max_health))
+    if bar is None:
+        bar_width = 40
+        bar_height = 5
+        bar = pygame.Surface((bar_width, bar_height))
+        # Background (dark red)
+        bar.fill((100, 0, 0))
+        # Health (green)
+        health_ratio = max(0, health / max_health)
+        pygame.draw.rect(bar, (0, 200, 0), (0, 0, bar_width * health_ratio, bar_height))
+        # Border
+        pygame.draw.rect(bar, WHITE, (0, 0, bar_width, bar_height), 1)
+        _health_bars[(health, max_health)] = memory.track(bar, "ui")
+    return bar
+
+
+# what changes while playing, copied by snapshot()
+SNAPSHOT_FIELDS = ("state", "frames", "current_frame", "image", "mask", "last_update", "alive",
+                   "health", "attacking", "swing", "side_left", "alpha", "last_attack_time",
+                   "last_damage_time")
+
+
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, health, attack_damage, speed, scale, target):
+    def __init__(self, x, y, health, attack_damage, speed, scale, target, attack_range=70, vision_range=300):
         super().__init__()
         self.animations = animation_orc
         self.frame_width, self.frame_height = 100, 100
@@ -20,18 +53,23 @@ class Enemy(pygame.sprite.Sprite):
         self.frames = self.load_frames(self.animations[self.state])
         self.current_frame = 0
         self.image = self.frames[self.current_frame]
+        self.mask = mask_table.masks(self.animations[self.state], self.scales)[self.current_frame]
         self.rect = self.image.get_rect(topleft=(x, y))
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = game_clock.get_ticks()
         self.alive = True
         self.health = self.max_health = health
         self.attack_damage = attack_damage
         self.speed = speed
         self.target = target
-        self.attack_range = 70
-        self.vision_range = 300
+        self.attack_range = attack_range
+        self.vision_range = vision_range
         self.damage_cooldown = 800
         self.last_attack_time = 0
         self.attacking = False
+        self.team = "orc"
+        self.swing = 0  # counts attacks, each one hits a target at most once
+        # physics body (level.physics moves the rect)
+        self.body = mask_table.body(self.animations["idle"], scale)
         self.side_left = True
         self.alpha = 0
 
@@ -41,38 +79,47 @@ class Enemy(pygame.sprite.Sprite):
         self.last_damage_time=0
         self.damage_taken_cooldown=500
 
-        # Load sounds
-        self.death_sound = pygame.mixer.Sound("Audio/orc_death.MP3")  # put your sound file path here
-        self.death_sound.set_volume(0.6)  # optional: control volume (0.0 - 1.0)
-
-    # Pre-scale frames when loading to improve performance
-    def load_frames(self, sprite_sheet):
-        frames = []
-        sheet_width = sprite_sheet.get_width()
-        num_frames = sheet_width // self.frame_width
-        for i in range(num_frames):
-            frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            frame.blit(sprite_sheet, (0, 0), (i * self.frame_width, 0, self.frame_width, self.frame_height))
-            # Scale the frame once
-            frame = pygame.transform.scale(frame, (int(self.frame_width * self.scales), int(self.frame_height * self.scales)))
-            frames.append(frame)
-        return frames
+    # Frames are sliced and scaled once per sheet by the shared animation atlas
+    def load_frames(self, sprite_sheet, flipped=False):
+        return atlas.get(sprite_sheet, self.scales, flipped)
+
+    def current_image(self):
+        return self.load_frames(self.animations[self.state], self.side_left)[self.current_frame]
+
+    def current_mask(self):
+        return mask_table.masks(self.animations[self.state], self.scales, self.side_left)[self.current_frame]
 
     def set_state(self, new_state):
         if new_state != self.state and new_state in self.animations:
             self.state = new_state
             self.frames = self.load_frames(self.animations[self.state])
             self.current_frame = 0
-            self.last_update = pygame.time.get_ticks()
+            self.last_update = game_clock.get_ticks()
             if self.state == "idle":
-                self.last_attack_time = pygame.time.get_ticks()
+                self.last_attack_time = game_clock.get_ticks()
+            if self.state == "attack":
+                self.swing += 1
             if self.state == "death":
                 self.alive = False
 
 
+    def snapshot(self):
+        """Frames and images are shared, so references are enough; a fading
+        orc also keeps the alpha of its private copy."""
+        fade = self.image.get_alpha() if self.alpha else None
+        return tuple(getattr(self, name) for name in SNAPSHOT_FIELDS), fade
+
+    def restore(self, snapshot):
+        values, fade = snapshot
+        for name, value in zip(SNAPSHOT_FIELDS, values):
+            setattr(self, name, value)
+        if fade is not None:
+            self.image = self.image.copy()
+            self.image.set_alpha(fade)
+
     def take_damage(self, damage):
         """Reduce health when hit by player"""
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
         # if now - self.last_damage_time > self.damage_taken_cooldown:
         self.set_state("hit")
         self.health -= damage
@@ -81,48 +128,28 @@ class Enemy(pygame.sprite.Sprite):
             self.health = 0
             self.alive = False
         if 0 < self.health < 2:
-            self.death_sound.play()
+            sound_bank.play("orc_death")
 
 
     
 
-    def draw_health_bar(self, screen, camera_x):
-        """Draw small health bar above enemy"""
-        if not self.alive:
-            return
-        
-        bar_width = 40
-        bar_height = 5
-        
-        # Position above enemy
-        x = self.rect.centerx-20
-        y = self.rect.centery-33
-        
-        # Only draw if on screen
-        # if -bar_width < x < 1024 + bar_width:
-            # Background (dark red)
-        pygame.draw.rect(screen, (100, 0, 0), (x, y, bar_width, bar_height))
-            
-            # Health (green)
-        health_ratio = max(0, self.health / self.max_health)
-        pygame.draw.rect(screen, (0, 200, 0), (x, y, bar_width * health_ratio, bar_height))
-            
-            # Border
-        pygame.draw.rect(screen, WHITE, (x, y, bar_width, bar_height), 1)
-
-
-    def update(self):
-        
-        now = pygame.time.get_ticks()
+    def update(self, action="idle"):
+        """Advance one tick. Chase/attack decisions and movement come from the
+        EnemyManager, which runs them for every orc in one vectorized pass;
+        hits are resolved by combat.Combat from the attack's frame data."""
+        now = game_clock.get_ticks()
         
         # Death check
 # --- DEATH CHECK ---
         if not self.alive:
             if self.state != "death":
-                self.death_sound.play()
+                sound_bank.play("orc_death")
                 self.set_state("death")
                 
             elif self.current_frame >= len(self.frames):
+                    if self.alpha == 0:
+                        # fade a private copy, the atlas frame is shared
+                        self.image = self.image.copy()
                     if self.alpha < 100:
                         self.image.set_alpha(100 - self.alpha*10)
                         self.alpha += 1
@@ -131,48 +158,29 @@ class Enemy(pygame.sprite.Sprite):
                     
             else:
                 self.last_update = now
-                self.image = pygame.transform.flip(self.frames[self.current_frame], self.side_left, False)    
+                self.image = self.current_image()
+                self.mask = self.current_mask()
                 self.current_frame+=1
                 # Fade out before killing
             return
         
-        dx = self.target.rect.centerx - self.rect.centerx
-        dy = self.target.rect.centery - self.rect.centery
-        distance = (dx**2 + dy**2)**0.5
-        print(distance)
-        # Flip sprite based on direction
-        self.side_left = dx < 0
-
-        
         # --- ATTACK LOGIC ---
         if not self.attacking:
-            if distance < self.attack_range:
-                self.set_state("idle")
-                now = pygame.time.get_ticks() 
-                if now - self.last_attack_time > self.damage_cooldown:
-                    self.set_state("attack")
-                    self.attacking = True
-                    self.last_attack_time = now
-                    
-            elif distance < self.vision_range:
-                self.set_state("walk")
-                if distance!=0:
-                    self.rect.x += int(self.speed * dx / distance)
-                    self.rect.y += int(self.speed * dy / distance)  
-            else:
-                self.set_state("idle")
-        else: 
-            if self.current_frame == len(self.frames)/2 and distance < self.attack_range:
-                self.target.take_damage(self.attack_damage)
+            self.set_state(action)
+            if action == "attack":
+                self.attacking = True
+                self.last_attack_time = now
 
-        self.image = pygame.transform.flip(self.frames[self.current_frame], self.side_left, False)
+        self.image = self.current_image()
+        self.mask = self.current_mask()
         
         # --- ANIMATION UPDATE FIRST ---
-        if now - self.last_update >= FPS:
+        if now - self.last_update >= ANIMATION_FRAME_MS:
             self.last_update = now
             self.current_frame += 1
             if self.current_frame >= len(self.frames):
-                if self.state == "attack":
+                if self.state in ("attack", "hit"):
+                    # a hit interrupts the swing
                     self.set_state("idle")
                     self.attacking = False
                 else:
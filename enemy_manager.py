@@ -0,0 +1,243 @@
+import numpy as np
+import pygame
+from settings import *
+from enemy import Enemy, health_bar, HEALTH_BAR_OFFSET
+from render_queue import SPRITES, OVERLAY
+import game_clock
+
+# AI decisions, indices into ACTIONS
+IDLE, WALK, ATTACK = 0, 1, 2
+ACTIONS = ("idle", "walk", "attack")
+
+# per-orc arrays kept in step with EnemyManager.enemies: name -> (row shape, dtype)
+FIELDS = {
+    "pos": ((2,), float),            # rect topleft
+    "prev_pos": ((2,), float),       # topleft before the last step
+    "half": ((2,), float),           # rect half size
+    "health": ((), float),
+    "alive": ((), bool),
+    "attacking": ((), bool),
+    "speed": ((), float),
+    "attack_range": ((), float),
+    "vision_range": ((), float),
+    "damage_cooldown": ((), float),
+    "last_attack": ((), np.int64),
+}
+
+
+class EnemyManager:
+    """Holds every orc in the level and runs their AI as one NumPy pass.
+
+    Per-orc data lives in parallel arrays (structure of arrays). The Enemy
+    sprites only keep what they need for animation and drawing. The arrays
+    are views of the first len(self) rows of columns that double when full,
+    so spawning an orc only writes one row.
+    """
+    def __init__(self, target):
+        self.target = target
+        self.level = None
+        self.enemies = []
+        self.group = pygame.sprite.Group()
+        self._columns = {}
+        self._allocate(0)
+
+    def _allocate(self, capacity, keep=0):
+        """New columns with room for `capacity` orcs; the first `keep` rows are copied over."""
+        old = self._columns
+        self._columns = {name: np.zeros((capacity, *shape), dtype) for name, (shape, dtype) in FIELDS.items()}
+        for name, column in old.items():
+            self._columns[name][:keep] = column[:keep]
+        self._use(keep)
+
+    def _use(self, n):
+        """Point the per-orc arrays at the first n rows."""
+        for name, column in self._columns.items():
+            setattr(self, name, column[:n])
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def __iter__(self):
+        return iter(self.enemies)
+
+    # ----------------------------------------------------------------------
+    def reset(self, level, **stats):
+        """Drop all orcs and spawn the ones listed by the level; stats
+        override the spawn() defaults."""
+        self.clear()
+        self.level = level
+        for x, y in level.enemy_spawns:
+            self.spawn(x, y, **stats)
+
+    def clear(self):
+        if self.level is not None:
+            for enemy in self.enemies:
+                self.level.remove_entity(enemy)
+        self.enemies = []
+        self.group.empty()
+        self._use(0)
+
+    def spawn(self, x, y, health=ENEMY_HEALTH, attack_damage=ENEMY_ATTACK_DAMAGE,
+              speed=ENEMY_SPEED, scale=3, attack_range=70, vision_range=300):
+        enemy = Enemy(x, y, health, attack_damage, speed, scale, self.target, attack_range, vision_range)
+        row = len(self.enemies)
+        if row == len(self._columns["pos"]):
+            self._allocate(max(8, 2 * row), keep=row)
+        self.enemies.append(enemy)
+        self.group.add(enemy)
+        if self.level is not None:
+            self.level.add_entity(enemy, enemy.body)
+
+        values = {
+            "pos": enemy.rect.topleft,
+            "prev_pos": enemy.rect.topleft,
+            "half": (enemy.rect.width / 2, enemy.rect.height / 2),
+            "health": enemy.health,
+            "alive": enemy.alive,
+            "attacking": enemy.attacking,
+            "speed": enemy.speed,
+            "attack_range": enemy.attack_range,
+            "vision_range": enemy.vision_range,
+            "damage_cooldown": enemy.damage_cooldown,
+            "last_attack": enemy.last_attack_time,
+        }
+        for name in FIELDS:
+            self._columns[name][row] = values[name]
+        self._use(row + 1)
+        return enemy
+
+    def any_alive(self):
+        return bool(self.alive.any())
+
+    # ----------------------------------------------------------------------
+    def think(self, now):
+        """Chase/attack/vision checks for all orcs at once.
+
+        Returns the action per orc, the facing, the walking speed and who
+        should jump.
+        """
+        target = np.array(self.target.rect.center, dtype=float)
+        delta = target - (self.pos + self.half)
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        side_left = delta[:, 0] < 0
+
+        in_attack = distance < self.attack_range
+        in_vision = distance < self.vision_range
+        ready = (now - self.last_attack) > self.damage_cooldown
+        free = self.alive & ~self.attacking
+
+        action = np.full(len(self.enemies), IDLE, dtype=np.int8)
+        action[free & ~in_attack & in_vision] = WALK
+        action[free & in_attack & ready] = ATTACK
+
+        # follow the level's shared flow field toward the target; orcs in the
+        # air or off the graph steer straight at it. Only walkers read it, so
+        # it is not touched while none is walking
+        walking = action == WALK
+        direction = np.sign(delta[:, 0])
+        jump = np.zeros(len(self.enemies), dtype=bool)
+        if walking.any() and self.level is not None and self.target in self.level.physics:
+            nav = self.level.navigation()
+            physics = self.level.physics
+            box = physics.box(self.target)
+            nav.set_target(int(nav.locate([box.centerx], [box.bottom])[0]))
+            ids = physics.ids(self.enemies)
+            pos, size = physics.pos[ids], physics.size[ids]
+            nodes = nav.locate(pos[:, 0] + size[:, 0] / 2, pos[:, 1] + size[:, 1])
+            nodes[~physics.on_ground[ids]] = -1
+            guided = (nodes >= 0) & (nodes != nav.target)
+            guided[guided] = nav.reachable[nodes[guided]]
+            direction = np.where(guided, nav.flow_dir[nodes], direction)
+            jump = guided & nav.flow_jump[nodes]
+
+        side_left = np.where(walking & (direction != 0), direction < 0, side_left)
+        vx = np.where(walking, direction * self.speed, 0.0)
+        return action, side_left, vx, walking & jump
+
+    def update(self):
+        if not self.enemies:
+            return
+        now = game_clock.get_ticks()
+        action, side_left, vx, jump = self.think(now)
+        if self.level is not None:
+            physics = self.level.physics
+            ids = physics.ids(self.enemies)
+            physics.drive_many(ids, vx)
+            physics.jump_many(ids[jump], ENEMY_JUMP_POWER)
+
+        gone = []
+        for i, enemy in enumerate(self.enemies):
+            if enemy.alive:
+                enemy.side_left = bool(side_left[i])
+            enemy.update(ACTIONS[action[i]])
+
+            if not enemy.groups():
+                gone.append(i)
+                continue
+            # pull back what the sprite changed this tick
+            self.alive[i] = enemy.alive
+            self.attacking[i] = enemy.attacking
+            self.health[i] = enemy.health
+            self.last_attack[i] = enemy.last_attack_time
+
+        if gone:
+            self._remove(gone)
+
+    def sync_positions(self):
+        """Pick up where the physics step moved the orcs."""
+        if self.enemies and self.level is not None:
+            physics = self.level.physics
+            self.pos[:] = physics.sprite_pos(physics.ids(self.enemies))
+
+    def _remove(self, indices):
+        keep = np.ones(len(self.enemies), dtype=bool)
+        keep[indices] = False
+        for i in indices:
+            if self.level is not None:
+                self.level.remove_entity(self.enemies[i])
+        n = len(self.enemies)
+        self.enemies = [e for e, k in zip(self.enemies, keep) if k]
+        for column in self._columns.values():
+            column[:len(self.enemies)] = column[:n][keep]
+        self._use(len(self.enemies))
+
+    def remember_positions(self):
+        self.prev_pos[:] = self.pos
+
+    def snapshot(self):
+        return (tuple(self.enemies), {name: getattr(self, name).copy() for name in FIELDS},
+                [enemy.snapshot() for enemy in self.enemies])
+
+    def restore(self, snapshot):
+        """Bring the orcs back as they were, dead and removed ones included.
+        Their physics bodies are restored by the level."""
+        enemies, arrays, states = snapshot
+        self.enemies = list(enemies)
+        n = len(self.enemies)
+        if n > len(self._columns["pos"]):
+            self._allocate(n)
+        for name, values in arrays.items():
+            self._columns[name][:n] = values
+        self._use(n)
+        self.prev_pos[:] = self.pos
+        self.group.empty()
+        self.group.add(*self.enemies)
+        for enemy, state in zip(self.enemies, states):
+            enemy.restore(state)
+
+    # ----------------------------------------------------------------------
+    def drawn_pos(self, alpha=1.0):
+        """Sprite positions interpolated between the last two steps."""
+        return self.prev_pos + (self.pos - self.prev_pos) * alpha
+
+    def queue_sprites(self, queue, alpha=1.0):
+        queue.add_many([enemy.image for enemy in self.enemies], self.drawn_pos(alpha), self.half * 2, SPRITES)
+
+    def queue_health_bars(self, queue, alpha=1.0):
+        """Queue the bars of living orcs, just above their heads."""
+        living = [i for i, enemy in enumerate(self.enemies) if enemy.alive]
+        if not living:
+            return
+        bars = [health_bar(self.enemies[i].health, self.enemies[i].max_health) for i in living]
+        pos = (self.drawn_pos(alpha) + self.half)[living] - HEALTH_BAR_OFFSET
+        queue.add_many(bars, pos, [bar.get_size() for bar in bars], OVERLAY)
@@ -0,0 +1,30 @@
+import pygame
+
+
+class SimulationClock:
+    """Game time in milliseconds that only moves when the game loop steps it."""
+    def __init__(self, start_ms=0):
+        self.ticks = start_ms
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+    def advance(self, ms):
+        self.ticks += ms
+
+
+# None means real time from pygame
+_clock = None
+
+
+def use_clock(clock):
+    """Make every game_clock.get_ticks() call read from `clock` (None = wall clock)."""
+    global _clock
+    _clock = clock
+
+
+def get_ticks():
+    """Current game time in ms; use this instead of pygame.time.get_ticks()."""
+    if _clock is None:
+        return pygame.time.get_ticks()
+    return _clock.get_ticks()
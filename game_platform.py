@@ -1,9 +1,10 @@
 import pygame
 from settings import *
+from memory import memory
 
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, color=(100, 80, 40)):
         super().__init__()
-        self.image = pygame.Surface((width, height))
+        self.image = memory.track(pygame.Surface((width, height)), "world")
         self.image.fill(color)
         self.rect = self.image.get_rect(topleft=(x, y))
@@ -1,107 +1,257 @@
 import os
 import pygame
 from settings import *
+from spatial import SpatialHash
+from physics import PhysicsWorld
+from navigation import NavGraph
+from assets import asset_cache
+from memory import memory
+from level_format import LevelFile, open_level
+from render_queue import BACKGROUND, WORLD
+
+
+def background_layer_files(layer_files):
+    """(path, parallax speed) of the background layers that exist.
+    Rear = far = slower, mid = closer = faster."""
+    bg_dir = os.path.join(os.getcwd(), "assets", "backgrounds")
+    paths = [(os.path.join(bg_dir, name), speed) for name, speed in layer_files]
+    return [(path, speed) for path, speed in paths if os.path.isfile(path)]
 
 
 class Level:
-    """Level with two parallax layers (rear + mid) and platforms."""
-    def __init__(self, level_number: int = 1):
-        from game_platform import Platform
+    """Level loaded from a memory-mapped level file: parallax layers (rear +
+    mid), platforms streamed in by chunk as the camera approaches, spawns.
+    `path` plays a compiled level file other than levels/levelN.lvl (the
+    benchmarks generate their own)."""
+    def __init__(self, level_number: int = 1, path=None):
         self.number = level_number
         self.ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
+        self.file = LevelFile(path) if path else open_level(level_number)
+        self.world_width = self.file.world_width
+        self.chunk_width = self.file.chunk_width
 
         # Platforms
         self.platforms = pygame.sprite.Group()
-        self.layouts = {
-            1: [
-                (200, 600, 200, 20),
-                (500, 450, 200, 20),
-                (800, 300, 150, 20),
-                (1200, 550, 220, 20),
-            ],
-            2: [
-                (100, 500, 200, 20),
-                (400, 400, 200, 20),
-                (900, 300, 250, 20),
-                (1500, 500, 180, 20),
-                (1900, 350, 150, 20),
-            ],
-            3: [
-                (150, 550, 200, 20),
-                (600, 450, 220, 20),
-                (1000, 350, 200, 20),
-                (1700, 600, 150, 20),
-            ],
-        }
-        for p in self.layouts.get(self.number, []):
-            self.platforms.add(Platform(*p))
+        # Spatial index of platforms and characters: chunk pre-rendering
+        # finds platforms in it, combat the fighters near a swing
+        self.spatial = SpatialHash(SPATIAL_CELL_SIZE)
+        # Gravity and platform landing for every character
+        self.physics = PhysicsWorld(self.ground_y, self.world_width)
+        # Enemy navigation over the loaded chunks, rebuilt when they change
+        # (once per stream step at most, however many chunks it swapped)
+        self._nav = None
+        # Enemy spawn points, orcs start just above the ground
+        self.enemy_spawns = list(self.file.spawns)
+
+        # Static ground + platforms, pre-rendered per chunk on demand
+        self._chunks = {}
+        self._chunk_top = min(self.ground_y, max(0, self.file.top))
+
+        # Streamed platform chunks: loaded chunk indices, record -> [platform, refs]
+        self._loaded = set()
+        self._streamed = {}
 
         self.layers = []
         self._load_background_layers()
+        self.stream(0)
+
+    def add_platform(self, x, y, width, height, update_nav=True):
+        """Add a platform to the world (streamed chunks use this too, and
+        drop the navigation once for the whole chunk instead)."""
+        from game_platform import Platform
+        platform = Platform(x, y, width, height)
+        self.platforms.add(platform)
+        self.spatial.add(platform, platform.rect)
+        self.physics.add_platform(platform)
+        if update_nav:
+            self._nav = None
+        if platform.rect.top < self._chunk_top:
+            # chunks only cover from the highest platform down
+            self._chunk_top = max(0, platform.rect.top)
+            self.invalidate_chunks()
+        else:
+            self.invalidate_chunks(platform.rect)
+        return platform
 
     # ----------------------------------------------------------------------
     def _load_background_layers(self):
-        """Load level-specific parallax backgrounds (rear & mid)."""
-        bg_dir = os.path.join(os.getcwd(), "assets", "backgrounds")
-        print(f"📁 Background folder: {bg_dir}")
-
-
-
-        # Expected filenames (use your exact files)
-        layer_files = [
-            (f"level{self.number}rear.png", 0.3),  # rear = far = slower
-            (f"level{self.number}mid.png", 0.6),   # mid = closer = faster
-        ]
-
-        for name, speed in layer_files:
-            path = os.path.join(bg_dir, name)
-            if os.path.isfile(path):
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    scale = SCREEN_HEIGHT / img.get_height()
-                    img = pygame.transform.smoothscale(
-                        img, (int(img.get_width() * scale), SCREEN_HEIGHT)
-                    )
-                    self.layers.append((img, speed))
-                except Exception as e:
-                    print(f"Failed to load {name}:", e)
+        """Level-specific parallax backgrounds (rear & mid), decoded and
+        scaled once and shared through the asset cache."""
+        for path, speed in background_layer_files(self.file.backgrounds):
+            img = asset_cache.image(path, SCREEN_HEIGHT)
+            if img is not None:
+                self.layers.append((img, speed))
 
         # Fallback (if missing files)
         if not self.layers:
-            surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            surf = memory.track(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), "backgrounds")
             surf.fill(SKY_BLUE)
             self.layers.append((surf, 0.2))
 
+    @staticmethod
+    def prefetch(level_number: int):
+        """Decode and scale another level's backgrounds in the background."""
+        level_file = open_level(level_number)
+        for path, _ in background_layer_files(level_file.backgrounds):
+            asset_cache.prefetch_image(path, SCREEN_HEIGHT)
+        level_file.close()
+
     # ----------------------------------------------------------------------
-    def draw_background(self, surface, camera_x: int = 0):
-        """Draw parallax background layers."""
+    def queue_background(self, queue, camera_x: int = 0):
+        """Queue the parallax background layers, two tiles each, fixed to the view."""
         for img, speed in self.layers:
-            w = img.get_width()
+            w, h = img.get_size()
             x = -int(camera_x * speed) % w
-            surface.blit(img, (x - w, 0))
-            surface.blit(img, (x, 0))
+            queue.add_many((img, img), ((x - w, 0), (x, 0)), ((w, h), (w, h)), BACKGROUND, parallax=0)
 
-    def draw_ground(self, surface, camera_x: int = 0):
-        """Draw simple flat ground."""
+    def draw_ground(self, surface, camera_x: int = 0, top: int = 0):
+        """Draw simple flat ground; world y is shifted up by `top`."""
         ground_color = (40, 60, 90)
-        pygame.draw.rect(surface, (40, 60, 90), (0 - camera_x, self.ground_y, WORLD_WIDTH, GROUND_HEIGHT))
+        ground_y = self.ground_y - top
+        pygame.draw.rect(surface, ground_color, (0 - camera_x, ground_y, self.world_width, GROUND_HEIGHT))
 
         tick_color = (90, 120, 160)
         spacing = 64
         offset = (-int(camera_x)) % spacing
-        for x in range(offset, SCREEN_WIDTH + spacing, spacing):
-            pygame.draw.line(surface, tick_color, (x, self.ground_y), (x, self.ground_y + 12), 2)
-
-    def draw_platforms(self, surface, camera_x: int = 0):
-        """Draw all platforms relative to camera, only if visible."""
-        for p in self.platforms:
-            screen_x = p.rect.x - camera_x
-            if -200 < screen_x < SCREEN_WIDTH + 200:  # simple cull
-                surface.blit(p.image, (screen_x, p.rect.y))
-
-
-    def draw(self, surface, camera_x: int = 0):
-        """Render order: background → ground → platforms."""
-        self.draw_background(surface, camera_x)
-        self.draw_ground(surface, camera_x)
-        self.draw_platforms(surface, camera_x)
+        for x in range(offset, surface.get_width() + spacing, spacing):
+            pygame.draw.line(surface, tick_color, (x, ground_y), (x, ground_y + 12), 2)
+
+    def draw_platforms(self, surface, camera_x: int = 0, top: int = 0):
+        """Draw the platforms that fall inside the surface."""
+        view = pygame.Rect(int(camera_x), top, surface.get_width(), surface.get_height())
+        for p in self.platforms_in(view):
+            surface.blit(p.image, (p.rect.x - camera_x, p.rect.y - top))
+
+    # ----------------------------------------------------------------------
+    def _build_chunk(self, index):
+        """Pre-render ground and platforms of one chunk-wide slice."""
+        if self.load_chunk(index):
+            self._nav = None
+        x0 = index * self.chunk_width
+        width = min(self.chunk_width, self.world_width - x0)
+        chunk = pygame.Surface((width, SCREEN_HEIGHT - self._chunk_top))
+        chunk.fill(CHUNK_COLORKEY)
+        self.draw_ground(chunk, x0, self._chunk_top)
+        self.draw_platforms(chunk, x0, self._chunk_top)
+        chunk.set_colorkey(CHUNK_COLORKEY, pygame.RLEACCEL)
+        self._chunks[index] = memory.track(chunk, "world")
+        return chunk
+
+    def queue_world(self, queue, camera_x: int = 0):
+        """Queue the static world chunks overlapping the camera, building the
+        next one on each side before the camera reaches it."""
+        camera_x = int(camera_x)
+        first_visible, last_visible = self.visible_chunks(camera_x)
+        for index in range(max(0, first_visible - 1), min(self.file.chunk_count - 1, last_visible + 1) + 1):
+            chunk = self._chunks.get(index)
+            if chunk is None:
+                chunk = self._build_chunk(index)
+            if first_visible <= index <= last_visible:
+                queue.add(chunk, (index * self.chunk_width, self._chunk_top), WORLD)
+
+    def invalidate_chunks(self, rect=None):
+        """Drop pre-rendered chunks touching rect (all of them if None)."""
+        if rect is None:
+            self._chunks.clear()
+            return
+        for index in range(rect.left // self.chunk_width, (rect.right - 1) // self.chunk_width + 1):
+            self._chunks.pop(index, None)
+
+    # ----------------------------------------------------------------------
+    def visible_chunks(self, camera_x: int = 0):
+        """First and last chunk index overlapping the screen."""
+        camera_x = int(camera_x)
+        last = self.file.chunk_count - 1
+        first_visible = min(last, max(0, camera_x // self.chunk_width))
+        last_visible = min(last, (camera_x + SCREEN_WIDTH - 1) // self.chunk_width)
+        return first_visible, last_visible
+
+    def stream(self, camera_x: int = 0):
+        """Load platform chunks as the camera approaches, unload the ones
+        left far behind; memory follows the visible area, not the level size."""
+        first, last = self.visible_chunks(camera_x)
+        changed = False
+        for index in range(first - STREAM_LOAD_CHUNKS, last + STREAM_LOAD_CHUNKS + 1):
+            changed |= self.load_chunk(index)
+        keep_first, keep_last = first - STREAM_KEEP_CHUNKS, last + STREAM_KEEP_CHUNKS
+        for index in [i for i in self._loaded if not keep_first <= i <= keep_last]:
+            changed |= self.unload_chunk(index)
+        if changed:
+            self._nav = None
+        if self._loaded:
+            # bodies beyond the loaded platforms wait instead of falling through
+            self.physics.active_span = (min(self._loaded) * self.chunk_width,
+                                        (max(self._loaded) + 1) * self.chunk_width)
+
+    def load_chunk(self, index):
+        """Bring a chunk's platforms in; returns whether it was loaded now.
+        The navigation is left to the caller."""
+        if index in self._loaded or not 0 <= index < self.file.chunk_count:
+            return False
+        self._loaded.add(index)
+        for record in self.file.chunk_platforms(index):
+            entry = self._streamed.get(record)
+            if entry is None:
+                self._streamed[record] = [self.add_platform(*record, update_nav=False), 1]
+            else:
+                entry[1] += 1
+        return True
+
+    def unload_chunk(self, index):
+        """Drop a chunk's platforms; returns whether it was loaded.
+        The navigation is left to the caller."""
+        if index not in self._loaded:
+            return False
+        self._loaded.discard(index)
+        self._chunks.pop(index, None)
+        for record in self.file.chunk_platforms(index):
+            entry = self._streamed[record]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._streamed[record]
+                self.remove_platform(entry[0], update_nav=False)
+        return True
+
+    def remove_platform(self, platform, update_nav=True):
+        platform.kill()
+        self.spatial.remove(platform)
+        self.physics.remove_platform(platform)
+        if update_nav:
+            self._nav = None
+        self.invalidate_chunks(platform.rect)
+
+    # ----------------------------------------------------------------------
+    def platforms_in(self, rect):
+        return [obj for obj in self.spatial.query(rect) if obj in self.platforms]
+
+    def add_entity(self, sprite, body=None):
+        """Index a sprite; with a body (Rect local to sprite.rect) physics moves it too."""
+        self.spatial.add(sprite, sprite.rect)
+        if body is not None:
+            self.physics.add(sprite, body)
+
+    def remove_entity(self, sprite):
+        self.spatial.remove(sprite)
+        self.physics.remove(sprite)
+
+    def restore_bodies(self, snapshot):
+        """Restore a physics snapshot and re-index the sprites it holds."""
+        before = set(self.physics.owners)
+        self.physics.restore(snapshot)
+        for sprite in before.difference(self.physics.owners):
+            self.spatial.remove(sprite)
+        for sprite in self.physics.owners:
+            self.spatial.add(sprite, sprite.rect)
+
+    def navigation(self):
+        """Navigation graph of the loaded chunks and their platforms."""
+        if self._nav is None:
+            left, right = self.physics.active_span
+            span = (left, min(right, self.world_width))
+            self._nav = NavGraph(self.ground_y, span, [p.rect for p in self.platforms])
+        return self._nav
+
+    def step_physics(self):
+        """Move every body one tick and keep the spatial index in step."""
+        for sprite in self.physics.step():
+            self.spatial.move(sprite, sprite.rect)
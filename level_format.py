@@ -0,0 +1,169 @@
+"""Level files.
+
+Levels are written by hand as JSON in levels/levelN.json:
+
+    {
+        "world_width": 2000,
+        "backgrounds": [["level1rear.png", 0.3], ["level1mid.png", 0.6]],
+        "platforms": [[x, y, width, height], ...],
+        "spawns": [[x, y], ...]
+    }
+
+and compiled to a compact binary levels/levelN.lvl that the game memory-maps.
+The binary splits platforms into fixed-width spatial chunks so a level only
+reads the chunks near the camera:
+
+    header      magic, version, chunk width, world width, top, counts
+    backgrounds (name, parallax speed) per layer
+    spawns      (x, y) per enemy
+    chunk index (first record, record count) per chunk
+    platforms   (x, y, width, height) records, grouped by chunk
+
+A platform crossing a chunk border is stored in every chunk it touches.
+
+    python level_format.py          # compile every levels/*.json
+"""
+import glob
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+from settings import *
+
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+MAGIC = b"LVL1"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIIiII")  # magic, version, backgrounds, chunk width, world width, top, spawns, chunks
+NAME_SIZE = 60
+BACKGROUND = struct.Struct(f"<{NAME_SIZE}sf")
+SPAWN = struct.Struct("<ii")
+CHUNK = struct.Struct("<II")
+PLATFORM = struct.Struct("<iiii")
+
+
+def source_path(level_number: int):
+    return os.path.join(LEVEL_DIR, f"level{level_number}.json")
+
+
+def binary_path(level_number: int):
+    return os.path.join(LEVEL_DIR, f"level{level_number}.lvl")
+
+
+def level_numbers():
+    """Numbers of the levels that have a source file, in order."""
+    numbers = []
+    for path in glob.glob(os.path.join(LEVEL_DIR, "level*.json")):
+        match = re.fullmatch(r"level(\d+)\.json", os.path.basename(path))
+        if match:
+            numbers.append(int(match.group(1)))
+    return sorted(numbers)
+
+
+def level_count():
+    """Levels playable in order: 1, 2, ... up to the first missing number."""
+    numbers = set(level_numbers())
+    count = 0
+    while count + 1 in numbers:
+        count += 1
+    return count
+
+
+# ----------------------------------------------------------------------
+def compile_level(src, dst, chunk_width=WORLD_CHUNK_WIDTH):
+    """Write the binary form of a JSON level source."""
+    with open(src) as f:
+        data = json.load(f)
+    world_width = int(data.get("world_width", WORLD_WIDTH))
+    backgrounds = data.get("backgrounds", [])
+    spawns = data.get("spawns", [])
+    platforms = data.get("platforms", [])
+
+    chunk_count = max(1, (world_width + chunk_width - 1) // chunk_width)
+    chunks = [[] for _ in range(chunk_count)]
+    for x, y, w, h in platforms:
+        first = max(0, x // chunk_width)
+        last = min(chunk_count - 1, (x + w - 1) // chunk_width)
+        for i in range(first, last + 1):
+            chunks[i].append((x, y, w, h))
+    top = min([y for _, y, _, _ in platforms], default=SCREEN_HEIGHT - GROUND_HEIGHT)
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, len(backgrounds), chunk_width, world_width,
+                                top, len(spawns), chunk_count))
+    for name, speed in backgrounds:
+        encoded = name.encode("utf-8")
+        if len(encoded) > NAME_SIZE:
+            # struct would silently cut it short
+            raise ValueError(f"{src}: background name {name!r} is longer than {NAME_SIZE} bytes")
+        out += BACKGROUND.pack(encoded, speed)
+    for x, y in spawns:
+        out += SPAWN.pack(x, y)
+    first = 0
+    for records in chunks:
+        out += CHUNK.pack(first, len(records))
+        first += len(records)
+    for records in chunks:
+        for record in records:
+            out += PLATFORM.pack(*record)
+
+    tmp = dst + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, dst)
+
+
+def ensure_compiled(level_number: int):
+    """Path of the binary level, rebuilt when the source is newer."""
+    src, dst = source_path(level_number), binary_path(level_number)
+    if os.path.isfile(src) and (not os.path.isfile(dst) or os.path.getmtime(dst) < os.path.getmtime(src)):
+        compile_level(src, dst)
+    return dst
+
+
+class LevelFile:
+    """Memory-mapped binary level. Opening it only parses the small header;
+    platform records are read per chunk on demand."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._mmap
+        (magic, version, n_backgrounds, self.chunk_width, self.world_width,
+         self.top, n_spawns, self.chunk_count) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} level file")
+
+        offset = HEADER.size
+        self.backgrounds = []
+        for _ in range(n_backgrounds):
+            name, speed = BACKGROUND.unpack_from(buf, offset)
+            self.backgrounds.append((name.rstrip(b"\0").decode("utf-8"), speed))
+            offset += BACKGROUND.size
+        self.spawns = [SPAWN.unpack_from(buf, offset + i * SPAWN.size) for i in range(n_spawns)]
+        offset += n_spawns * SPAWN.size
+        self._chunk_index = offset
+        self._records = offset + self.chunk_count * CHUNK.size
+
+    def chunk_platforms(self, index):
+        """(x, y, width, height) of the platforms touching chunk `index`."""
+        if not 0 <= index < self.chunk_count:
+            return []
+        first, count = CHUNK.unpack_from(self._mmap, self._chunk_index + index * CHUNK.size)
+        start = self._records + first * PLATFORM.size
+        return list(PLATFORM.iter_unpack(self._mmap[start:start + count * PLATFORM.size]))
+
+    def close(self):
+        self._mmap.close()
+
+
+def open_level(level_number: int):
+    return LevelFile(ensure_compiled(level_number))
+
+
+if __name__ == "__main__":
+    for n in level_numbers():
+        compile_level(source_path(n), binary_path(n))
+        print(f"compiled {binary_path(n)}")
+    sys.exit(0)
@@ -1,55 +1,120 @@
-import sys
+import time
+STARTUP_T0 = time.perf_counter()  # before pygame and the game modules are imported
+import argparse
+import os
 import random
+import sys
 import pygame
 from settings import *
-from utils import draw_text
+from utils import draw_text, get_font, lerp
 from level import Level
 from player import Player
-from enemy import Enemy
+from enemy_manager import EnemyManager
+from combat import Combat
+from memory import memory
+from snapshots import SnapshotRing, WorldSnapshot
+from profiler import FrameProfiler
+from resolution import DynamicResolution
+from render_queue import RenderQueue, OVERLAY
+from menu import MenuRenderer
+from level_format import level_count
+from replay import LiveInput, Recorder, ReplayInput
+import game_clock
+IMPORT_MS = (time.perf_counter() - STARTUP_T0) * 1000
+
+def typed_digit(event):
+    """The digit 1-9 a key event typed, or None (other keys, or digits from
+    other scripts such as '²' that int() would reject or misread)."""
+    if len(event.unicode) == 1 and event.unicode in "123456789":
+        return int(event.unicode)
+    return None
+
 
 class Game:
 
-    def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
+    def __init__(self, headless=False, seed=None, input_source=None):
+        # Startup phases in ms, reported once the first frame is shown
+        self.startup_times = {"imports": IMPORT_MS}
+        self._startup_mark = time.perf_counter()
+        self.first_frame_shown = False
+
+        # Headless: no window and no audio
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            pygame.display.init()
+            pygame.font.init()
+        else:
+            pygame.init()
+            pygame.mixer.init()
+        # Game time only moves in fixed simulation steps
+        self.sim_clock = game_clock.SimulationClock()
+        game_clock.use_clock(self.sim_clock)
+        # Everything random is seeded and input is read once per tick, so a
+        # recorded session replays exactly
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.input = input_source if input_source is not None else LiveInput()
+        self.quit_requested = False
+        self.mark_startup("pygame_init")
 
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
+        self.mark_startup("display")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 28)
+        self.font = get_font(28)
+        self.debug_font = get_font(18)
+        self.profiler = FrameProfiler()
+        # the world is drawn at a resolution that follows the frame time
+        self.resolution = DynamicResolution(self.screen)
+        # drawables of a frame: the world at the render scale, the HUD on top at full size
+        self.world_queue = RenderQueue()
+        self.hud_queue = RenderQueue()
 
         # Menu state and pixel look
         self.state = "menu"  # menu | playing | level_complete | game_complete | level_select
         self.level_completed = {}  # e.g. {1: True, 2: False, 3: False}
-        for i in range(1, TOTAL_LEVELS + 1):
+        self.total_levels = level_count()
+        for i in range(1, self.total_levels + 1):
             self.level_completed[i] = False
 
-        self.menu_tick = 0
-        self.pixel_size = (256, 192)
-        self.pixel_font_small = pygame.font.Font(None, 16)
-        self.pixel_font_large = pygame.font.Font(None, 24)
-        self.menu_stars = [
-            (random.randrange(self.pixel_size[0]), random.randrange(self.pixel_size[1] // 2))
-            for _ in range(60)
-        ]
+        self.menu = MenuRenderer(self.screen, seed=self.seed)
+        self.mark_startup("menu")
 
-        # --- define world/level state BEFORE load_level() ---
+        # World/level state; the level itself is loaded when play starts
         self.level_number = 1
         self.level = None
         self.player = None
-        self.enemy = None
+        self.enemies = None
         self.camera_x = 0
-
-        self.lastDamage = 0
-        self.damageCooldown = 500  
-
-        # --- now it's safe to load level ---
-        self.load_level(self.level_number)
-
-
-    def load_level(self, n: int):
+        self.prev_camera_x = 0
+        self.prev_player_pos = (0, 0)
+
+        # hitbox/hurtbox resolution for every fighter
+        self.combat = Combat()
+        # spawn() overrides for every orc, used by balance sweeps
+        self.enemy_stats = {}
+        # level-start checkpoint and recent world states for restart/rewind
+        self.snapshots = SnapshotRing()
+        self.level_tick = 0
+
+
+    def mark_startup(self, name):
+        """Record how long the startup phase that just finished took."""
+        now = time.perf_counter()
+        self.startup_times[name] = (now - self._startup_mark) * 1000
+        self._startup_mark = now
+
+    def startup_summary(self):
+        total = sum(self.startup_times.values())
+        phases = "  ".join(f"{name} {ms:.1f}" for name, ms in self.startup_times.items())
+        return f"startup {total:.1f} ms: {phases}"
+
+    def load_level(self, n: int, level=None):
+        """Start level n; `level` is an already built Level to play as number n."""
         self.level_number = n
-        self.level = Level(level_number=n)
+        self.level = level if level is not None else Level(level_number=n)
+        # get the next level's backgrounds ready while this one is played
+        Level.prefetch(n + 1 if n < self.total_levels else 1)
 
         # Create player (preserve health logic if needed)
         if self.player is None:
@@ -57,34 +122,92 @@ class Game:
                                 PLAYER_HEALTH, PLAYER_ATTACK_DAMAGE, PLAYER_SPEED, 3)
         else:
             # Reset player position and health
-            self.player.x = 64
-            self.player.y = self.level.ground_y - PLAYER_HEIGHT
+            self.player.rect.topleft = (64, self.level.ground_y - PLAYER_HEIGHT - 100)
             self.player.health = PLAYER_HEALTH
+            self.player.alive = True
+            self.player.attacking = False
+            self.player.set_state("idle")
 
-        # --- Always create a new enemy ---
-        self.enemy = Enemy(800, self.level.ground_y - ENEMY_HEIGHT - 100,
-                        ENEMY_HEALTH, ENEMY_ATTACK_DAMAGE, ENEMY_SPEED, 3, self.player)
+        # --- Always respawn the level's enemies ---
+        if self.enemies is None:
+            self.enemies = EnemyManager(self.player)
+        self.enemies.reset(self.level, **self.enemy_stats)
 
+        self.level.add_entity(self.player, self.player.body)
         self.camera_x = 0
-
-
+        self.remember_positions()
+        self.level_tick = 0
+        self.snapshots.clear(checkpoint=self.capture())
+
+
+
+    # ----------------------------------------------------------------------
+    def capture(self):
+        """Snapshot of the level being played."""
+        return WorldSnapshot(self.level, self.level_tick, self.sim_clock.ticks, self.camera_x,
+                             self.player.snapshot(), self.enemies.snapshot(),
+                             self.level.physics.snapshot(), self.combat.snapshot())
+
+    def restore(self, snapshot):
+        """Put the level back as it was when the snapshot was taken; no assets are loaded."""
+        if snapshot is None or snapshot.level is not self.level:
+            return False
+        self.sim_clock.ticks = snapshot.time_ms
+        self.level_tick = snapshot.tick
+        self.camera_x = snapshot.camera_x
+        self.player.restore(snapshot.player)
+        self.enemies.restore(snapshot.enemies)
+        self.level.restore_bodies(snapshot.bodies)
+        self.combat.restore(snapshot.combat)
+        self.level.stream(self.camera_x)
+        self.remember_positions()
+        self.state = "playing"
+        return True
+
+    def restart(self):
+        """Back to the start of the level, without reloading it."""
+        self.snapshots.clear(checkpoint=self.snapshots.checkpoint)
+        return self.restore(self.snapshots.checkpoint)
+
+    def rewind(self):
+        """Go back about REWIND_TICKS; repeated rewinds keep going back."""
+        return self.restore(self.snapshots.rewind(self.level_tick - REWIND_TICKS))
+
+    def remember_positions(self):
+        """Keep the state before a simulation step for render interpolation."""
+        self.prev_camera_x = self.camera_x
+        self.prev_player_pos = self.player.rect.topleft
+        self.enemies.remember_positions()
 
     def update_camera(self):
         """Follow player horizontally with smooth offset."""
         player_center_x = self.player.rect.centerx
         target = player_center_x - SCREEN_WIDTH // 2
-        self.camera_x = max(0, min(target, WORLD_WIDTH - SCREEN_WIDTH))
+        self.camera_x = max(0, min(target, self.level.world_width - SCREEN_WIDTH))
+
 
+    def quit(self):
+        """Save the frame timings (and recording) and leave. Headless games
+        and replays only stop stepping, so batch runs keep their process and
+        a watched replay still prints its summary."""
+        if isinstance(self.input, Recorder):
+            self.input.save()
+        self.quit_requested = True
+        if self.headless or isinstance(self.input, ReplayInput):
+            return
+        self.profiler.dump()
+        pygame.quit()
+        sys.exit()
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.input.events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
                 if self.state == "menu":
                     if event.key == pygame.K_RETURN:
                         # Start game
@@ -93,19 +216,20 @@ class Game:
                     elif event.key == pygame.K_4:
                         self.state = "level_select"
 
+                elif self.state in ("playing", "game_over") and event.key == pygame.K_r:
+                    self.restart()
+                elif self.state in ("playing", "game_over") and event.key == pygame.K_BACKSPACE:
+                    self.rewind()
                 elif self.state == "playing":
-                    if event.key == pygame.K_1:
-                        self.load_level(1)
-                    elif event.key == pygame.K_2:
-                        self.load_level(2)
-                    elif event.key == pygame.K_3:
-                        self.load_level(3)
+                    digit = typed_digit(event)
+                    if digit is not None and digit <= min(3, self.total_levels):
+                        self.load_level(digit)
                     elif event.key == pygame.K_4:
                         self.state = "level_select"
                 elif self.state == "level_complete":
                     if event.key == pygame.K_n:
                         # Go to next level or loop back to 1
-                        next_level = self.level_number + 1 if self.level_number < TOTAL_LEVELS else 1
+                        next_level = self.level_number + 1 if self.level_number < self.total_levels else 1
                         self.load_level(next_level)
                         self.state = "playing"
                     elif event.key == pygame.K_l:
@@ -114,10 +238,11 @@ class Game:
                         self.state = "menu"
 
                 elif self.state == "level_select":
+                    digit = typed_digit(event)
                     if event.key == pygame.K_m:
                         self.state = "menu"
-                    elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3):
-                        level_choice = int(event.unicode)
+                    elif digit is not None and digit <= self.total_levels:
+                        level_choice = digit
 
                         # Can only play a level if it is unlocked (previous completed) or already completed
                         if self.level_completed.get(level_choice - 1, True) or self.level_completed[level_choice]:
@@ -132,28 +257,34 @@ class Game:
     def update(self):
         if self.state == "menu":
             # Animate menu stars
-            self.menu_tick += 1
-            # Move stars slowly left; wrap around
-            new_stars = []
-            for x, y in self.menu_stars:
-                speed = 1 if y % 3 else 2
-                x -= speed
-                if x < 0:
-                    x = self.pixel_size[0] - 1
-                    y = random.randrange(self.pixel_size[1]//2)
-                new_stars.append((x, y))
-            self.menu_stars = new_stars
+            self.menu.update()
+            return
+        if self.level is None:
+            # level select before anything was played
+            return
+        if self.state == "game_over":
+            # the world holds still behind the game over text
             return
 
-        self.player.update()
-        self.enemy.update()
+        self.player.update(self.input.keys)
+        self.enemies.update()
+        physics = self.level.physics
+        physics.drive(self.player, self.player.move_x, PLAYER_JUMP_POWER if self.player.want_jump else 0)
+        self.level.step_physics()
+        self.player.on_ground = physics.grounded(self.player)
+        self.enemies.sync_positions()
         self.update_camera()
+        self.level.stream(self.camera_x)
+
+        if not self.player.alive and self.state == "playing":
+            # wait for R (restart), BACKSPACE (rewind) or ESC (quit)
+            self.state = "game_over"
 
         # --- LEVEL TRANSITION CHECK ---
         # When all enemies are dead AND player reaches end of level width
-        end_x = WORLD_WIDTH - 100  # near the right edge (you can tweak)
+        end_x = self.level.world_width - 100  # near the right edge (you can tweak)
 
-        if not self.enemy.alive and self.player.rect.right >= end_x and self.state == "playing":
+        if not self.enemies.any_alive() and self.player.rect.right >= end_x and self.state == "playing":
             # Mark level as completed
             self.level_completed[self.level_number] = True
             self.state = "level_complete"
@@ -170,9 +301,12 @@ class Game:
 
 
         
-    def draw(self):
+    def draw(self, alpha=1.0):
+        """Render; alpha is how far we are between the last two simulation steps."""
+        phase = self.profiler.phase
         if self.state == "menu":
-            self.draw_menu()
+            with phase("draw.menu"):
+                self.draw_menu()
         elif self.state == "level_complete":
             self.draw_level_complete()
         
@@ -181,75 +315,54 @@ class Game:
 
     
         else:
-            self.level.draw(self.screen, self.camera_x)
-            self.screen.blit(self.player.image, self.player.rect)
-            self.screen.blit(self.enemy.image, self.enemy.rect)
-
-            self.player.draw_health_bar(self.screen)
-            if self.enemy.alive:
-                self.enemy.draw_health_bar(self.screen, self.camera_x)
-
-            draw_text(self.screen, "A/D or Arrows to move, Space to attack, Esc to quit",
-                    self.font, WHITE, 16, 16)
-
-        pygame.display.flip()
-
-    """def draw_debug(self):
-       y = 44
-        line_h = 20
-        dbg = [
-            f"fps: {self.clock.get_fps():.1f}",
-            f"state: {self.state}",
-            f"level: {self.level_number}",
-            f"player x:{self.player.x:.1f} y:{self.player.y:.1f}",
-            f"vel vx:{self.player.vx:.1f} vy:{self.player.vy:.1f}",
-            f"camera_x:{self.camera_x}",
+            camera_x = round(lerp(self.prev_camera_x, self.camera_x, alpha))
+            px, py = self.player.rect.topleft
+            ox, oy = self.prev_player_pos
+            with phase("draw.queue"):
+                world = self.world_queue
+                self.level.queue_background(world, camera_x)
+                self.level.queue_world(world, camera_x)
+                world.add(self.player.image, (lerp(ox, px, alpha), lerp(oy, py, alpha)))
+                self.enemies.queue_sprites(world, alpha)
+            with phase("draw.world"):
+                world.flush(self.resolution.target, camera_x, self.resolution.scale)
+            with phase("draw.upscale"):
+                self.resolution.present()
+
+            with phase("draw.hud"):
+                hud = self.hud_queue
+                self.enemies.queue_health_bars(hud, alpha)
+                hud.add(self.player.health_bar(), (20, 50), OVERLAY, parallax=0)
+                hud.flush(self.screen, camera_x)
+                draw_text(self.screen, "A/D or Arrows to move, W/Up to jump, Space to attack, Esc to quit",
+                        self.font, WHITE, 16, 16)
+                if self.state == "game_over":
+                    draw_text(self.screen, "Game Over", self.font, RED,
+                              SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20, center=True)
+                    draw_text(self.screen, "R to restart, Backspace to rewind, Esc to quit", self.font, WHITE,
+                              SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20, center=True)
+
+        with phase("draw.profiler"):
+            self.draw_debug()
+        with phase("display.flip"):
+            pygame.display.flip()
+
+    def draw_debug(self):
+        """Frame-timing overlay, toggled with F3."""
+        if not self.profiler.visible:
+            return
+        lines = [
+            f"fps: {self.clock.get_fps():.1f}   state: {self.state}   level: {self.level_number}",
+            f"orcs: {len(self.enemies) if self.enemies else 0}   camera_x: {self.camera_x}   "
+            f"render scale: {self.resolution.scale:g}{' (auto)' if self.resolution.auto else ''}",
+            self.startup_summary(),
+            *memory.overlay_lines(),
         ]
-        for s in dbg:
-            draw_text(self.screen, s, self.font, WHITE, 16, y)
-            y += line_h"""
+        self.profiler.draw(self.screen, self.debug_font, lines)
 
     def draw_menu(self):
-        # Low-res render target for crisp pixel look
-        pw, ph = self.pixel_size
-        surf = pygame.Surface((pw, ph))
-        # Background gradient sky
-        surf.fill((40, 40, 75))
-        for i in range(ph//2):
-            c = 75 + i // 2
-            pygame.draw.line(surf, (c, 160, 220), (0, i), (pw, i))
-        # Starfield
-        for x, y in self.menu_stars:
-            surf.set_at((x, y), (255, 255, 255))
-        
-        # Silhouette hills
-        pygame.draw.rect(surf, (20, 35, 60), (0, ph-40, pw, 40))
-        pygame.draw.rect(surf, (15, 25, 45), (0, ph-28, pw, 28))
-
-        # Title and prompt (pixel fonts)
-        title = "Dungeon Platformer"
-        prompt = "Press ENTER to Start"
-        # Simple blinking
-        show_prompt = (self.menu_tick // 30) % 2 == 0
-        title_font = self.pixel_font_large
-        small_font = self.pixel_font_small
-        # Draw title centered
-        title_surf = title_font.render(title, True, WHITE)
-        trect = title_surf.get_rect(center=(pw//2, ph//2 - 20))
-        surf.blit(title_surf, trect)
-        # Prompt
-        if show_prompt:
-            prompt_surf = small_font.render(prompt, True, (255, 230, 120))
-            prect = prompt_surf.get_rect(center=(pw//2, ph//2 + 8))
-            surf.blit(prompt_surf, prect)
-        # Hint
-        hint = small_font.render("Esc to Quit • 1/2 choose level in-game", True, (210, 210, 210))
-        hrect = hint.get_rect(center=(pw//2, ph - 14))
-        surf.blit(hint, hrect)
-
-        # Scale up to screen size with nearest-neighbor
-        scaled = pygame.transform.scale(surf, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.screen.blit(scaled, (0, 0))
+        # Low-res pixel look, scaled into the screen by the menu renderer
+        self.menu.draw()
 
         
     def draw_level_complete(self):
@@ -258,7 +371,7 @@ class Game:
                 SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60, center=True)
 
         # If next level exists
-        if self.level_number < TOTAL_LEVELS:
+        if self.level_number < self.total_levels:
             draw_text(self.screen, "Press N for Next Level", self.font, WHITE,
                     SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 10, center=True)
         else:
@@ -290,7 +403,7 @@ class Game:
                 SCREEN_WIDTH // 2, 100, center=True)
 
         y_offset = 200
-        for i in range(1, TOTAL_LEVELS + 1):
+        for i in range(1, self.total_levels + 1):
             status = "Completed" if self.level_completed[i] else "Locked" if not self.level_completed.get(i - 1, True) else "Unlocked"
             color = GREEN if status == "Completed" else WHITE if status == "Unlocked" else GRAY
             draw_text(self.screen, f"Level {i}: {status}", self.font, color,
@@ -305,27 +418,115 @@ class Game:
 
 
 
-    def player_attack(self):
-        if self.player.attacking:
-            attack_block = self.player.get_attack_rect()
-            now = pygame.time.get_ticks()
-            if (attack_block is not None) and ((now-self.lastDamage) > self.damageCooldown):
-                if attack_block.colliderect(self.enemy.rect) :
-                    self.lastDamage = now
-                    self.enemy.take_damage(PLAYER_ATTACK_DAMAGE)
+    def resolve_combat(self):
+        """Land this tick's attacks, player and orcs alike."""
+        if self.level is not None and self.state == "playing":
+            self.combat.resolve([self.player, *self.enemies.enemies], self.level.physics, self.level.spatial)
 
-    def run(self):
-        print("🟢 Entering run loop")
-        while True:
-            # you can keep this commented after debugging to avoid spam
-            # print("loop")
+    def step(self):
+        """One fixed simulation tick, no drawing."""
+        phase = self.profiler.phase
+        if self.player is not None:
+            self.remember_positions()
+        with phase("handle_events"):
+            self.input.poll()
             self.handle_events()
-            self.draw()
+        with phase("update"):
             self.update()
-            self.player_attack()
-            self.clock.tick(FPS)
+        with phase("combat"):
+            self.resolve_combat()
+        self.sim_clock.advance(TICK_MS)
+        if self.state == "playing" and self.level is not None:
+            self.level_tick += 1
+            if self.snapshots.due(self.level_tick):
+                self.snapshots.push(self.capture())
+
+    def play_level(self, n: int):
+        self.load_level(n)
+        self.state = "playing"
+
+    def simulate(self, ticks):
+        """Step the current level as fast as possible for a number of ticks."""
+        for _ in range(ticks):
+            self.step()
+            if self.state != "playing":
+                break
+
+    def replay(self):
+        """Run a replay input source to its end as fast as possible; returns ticks run."""
+        ticks = 0
+        while not self.input.finished and not self.quit_requested:
+            self.step()
+            ticks += 1
+        return ticks
+
+    def run(self):
+        """Play in real time until the input source runs out (a watched
+        replay; live input never does) or quit() stops it; returns ticks run."""
+        print("🟢 Entering run loop")
+        # Fixed timestep: real time fills the accumulator, the simulation
+        # drains it in TICK_MS steps and rendering interpolates the rest.
+        accumulator = 0.0
+        ticks = 0
+        self.clock.tick()
+        while not self.input.finished and not self.quit_requested:
+            accumulator += self.clock.tick(MAX_RENDER_FPS)
+            work_start = time.perf_counter()
+            steps = 0
+            while accumulator >= TICK_MS and steps < MAX_CATCHUP_STEPS:
+                self.step()
+                accumulator -= TICK_MS
+                steps += 1
+                ticks += 1
+                if self.input.finished or self.quit_requested:
+                    break
+            if steps == MAX_CATCHUP_STEPS:
+                # too far behind (e.g. window dragged), drop the backlog
+                accumulator = min(accumulator, TICK_MS)
+            with self.profiler.phase("draw"):
+                self.draw(accumulator / TICK_MS)
+            self.profiler.end_frame()
+            self.resolution.record((time.perf_counter() - work_start) * 1000)
+            if not self.first_frame_shown:
+                self.first_frame_shown = True
+                self.mark_startup("first_frame")
+                print(self.startup_summary())
+        return ticks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dungeon platformer")
+    parser.add_argument("--record", metavar="FILE", help="save this session's input to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recorded session without a window")
+    parser.add_argument("--window", action="store_true", help="watch the replay in real time instead")
+    parser.add_argument("--render-scale", type=float, metavar="S",
+                        help="draw the world at S times the window size instead of following the frame time")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        source = ReplayInput(args.replay, watch=args.window)
+        game = Game(headless=not args.window, seed=source.seed, input_source=source)
+        if args.render_scale:
+            game.resolution.fix(args.render_scale)
+        start = time.perf_counter()
+        ticks = game.run() if args.window else game.replay()
+        wall = time.perf_counter() - start
+        hp = game.player.health if game.player else PLAYER_HEALTH
+        print(f"replayed {ticks} ticks in {wall:.2f} s ({ticks / max(wall, 1e-9):.0f} ticks/s): "
+              f"state {game.state}, level {game.level_number}, hp {hp}")
+        return
+
+    source = LiveInput()
+    if args.record:
+        source = Recorder(source, args.record, random.getrandbits(32))
+        game = Game(seed=source.seed, input_source=source)
+    else:
+        game = Game(input_source=source)
+    if args.render_scale:
+        game.resolution.fix(args.render_scale)
+    game.run()
+
 
 if __name__ == "__main__":
-    Game().run()
+    main()
 
 
@@ -0,0 +1,132 @@
+"""Memory accounting for surfaces, masks and sounds, per subsystem tag.
+
+Loaders hand what they create to `memory.track(obj, tag)`. The byte size is
+counted under the tag until the object is garbage collected (masks cannot be
+weakly referenced, so their owner calls release()). Totals and peaks are kept
+per tag; when a tag goes over its budget in MEMORY_BUDGETS_MB its evictor
+(if one was registered) is asked to free the excess, and a warning is
+printed if it stays over.
+
+Tags: backgrounds, characters, masks, world, render, ui, audio.
+"""
+import weakref
+
+import pygame
+from settings import *
+
+MB = 1024 * 1024
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def mask_bytes(mask):
+    # bitmask rows are stored in machine words
+    w, h = mask.get_size()
+    return (w + 63) // 64 * 8 * h
+
+
+def sound_bytes(sound):
+    init = pygame.mixer.get_init()
+    if not init or not isinstance(sound, pygame.mixer.Sound):
+        return 0
+    frequency, size, channels = init
+    return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+
+def size_of(obj):
+    if isinstance(obj, pygame.Surface):
+        return surface_bytes(obj)
+    if isinstance(obj, pygame.mask.Mask):
+        return mask_bytes(obj)
+    return sound_bytes(obj)
+
+
+class MemoryLedger:
+    def __init__(self, budgets_mb=MEMORY_BUDGETS_MB):
+        self.budgets = {tag: mb * MB for tag, mb in budgets_mb.items()}
+        self.totals = {}
+        self.peaks = {}
+        self.peak_total = 0
+        self._entries = {}  # id(obj) -> (tag, nbytes, finalizer or obj)
+        self._evictors = {}
+        self._over = set()  # tags already warned about
+
+    def track(self, obj, tag, nbytes=None):
+        """Count obj under tag while it lives; returns obj. Tracking it again does nothing."""
+        if obj is None or id(obj) in self._entries:
+            return obj
+        nbytes = size_of(obj) if nbytes is None else nbytes
+        key = id(obj)
+        try:
+            handle = weakref.finalize(obj, self._forget, key)
+            handle.atexit = False
+        except TypeError:
+            handle = obj  # kept alive until release()
+        self._entries[key] = (tag, nbytes, handle)
+        self._add(tag, nbytes)
+        return obj
+
+    def track_all(self, objs, tag):
+        for obj in objs:
+            self.track(obj, tag)
+        return objs
+
+    def release(self, obj):
+        entry = self._entries.get(id(obj))
+        if entry is not None:
+            if isinstance(entry[2], weakref.finalize):
+                entry[2].detach()
+            self._forget(id(obj))
+
+    def _forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            tag, nbytes, _ = entry
+            self.totals[tag] -= nbytes
+            if tag in self._over and self.totals[tag] <= self.budgets.get(tag, float("inf")):
+                self._over.discard(tag)
+
+    def _add(self, tag, nbytes):
+        total = self.totals[tag] = self.totals.get(tag, 0) + nbytes
+        self.peaks[tag] = max(self.peaks.get(tag, 0), total)
+        self.peak_total = max(self.peak_total, self.total())
+        budget = self.budgets.get(tag)
+        if budget is not None and total > budget:
+            self._over_budget(tag, budget)
+
+    def _over_budget(self, tag, budget):
+        evict = self._evictors.get(tag)
+        if evict is not None:
+            evict(self.totals[tag] - budget)
+        if self.totals[tag] > budget and tag not in self._over:
+            self._over.add(tag)
+            print(f"memory: {tag} at {self.totals[tag] / MB:.1f} MB, over its {budget / MB:.0f} MB budget")
+
+    def set_evictor(self, tag, evict):
+        """evict(nbytes) is called to free at least nbytes when tag goes over budget."""
+        self._evictors[tag] = evict
+
+    # ----------------------------------------------------------------------
+    def total(self):
+        return sum(self.totals.values())
+
+    def count(self, tag=None):
+        return sum(1 for entry in self._entries.values() if tag is None or entry[0] == tag)
+
+    def report(self):
+        """{tag: {"bytes", "peak", "budget", "count"}} for every tag seen."""
+        return {tag: {"bytes": self.totals[tag], "peak": self.peaks[tag],
+                      "budget": self.budgets.get(tag), "count": self.count(tag)}
+                for tag in sorted(self.totals)}
+
+    def overlay_lines(self):
+        """Short lines for the debug overlay."""
+        parts = [f"{tag} {total / MB:.1f}" for tag, total in sorted(self.totals.items()) if total]
+        return [f"memory: {self.total() / MB:.1f} MB (peak {self.peak_total / MB:.1f})",
+                "  " + "  ".join(parts)]
+
+
+# every loader in the game reports here
+memory = MemoryLedger()
@@ -0,0 +1,79 @@
+import numpy as np
+import pygame
+from settings import *
+from utils import get_font
+from memory import memory
+
+
+class MenuRenderer:
+    """Low-res pixel-art title screen.
+
+    The sky gradient, hills and text are rendered once. Each frame only the
+    static background is copied, the stars are plotted through a pixel array
+    and the result is scaled straight into the screen surface.
+    """
+    def __init__(self, screen, pixel_size=(256, 192), star_count=60, seed=None):
+        self.screen = screen
+        self.pixel_size = pixel_size
+        self.tick = 0
+        self.rng = np.random.default_rng(seed)
+
+        pw, ph = pixel_size
+        # same pixel format as the screen so scaling can write into it directly
+        self.surface = memory.track(pygame.Surface(pixel_size, 0, screen), "ui")
+        self.background = memory.track(self._build_background(), "ui")
+        self.star_color = self.surface.map_rgb((255, 255, 255))
+
+        self.star_x = self.rng.integers(0, pw, star_count)
+        self.star_y = self.rng.integers(0, ph // 2, star_count)
+
+        # Title, prompt and hint (pixel fonts)
+        small_font = get_font(16)
+        large_font = get_font(24)
+        self.title = large_font.render("Dungeon Platformer", True, WHITE)
+        self.title_rect = self.title.get_rect(center=(pw // 2, ph // 2 - 20))
+        self.prompt = small_font.render("Press ENTER to Start", True, (255, 230, 120))
+        self.prompt_rect = self.prompt.get_rect(center=(pw // 2, ph // 2 + 8))
+        self.hint = small_font.render("Esc to Quit • 1/2 choose level in-game", True, (210, 210, 210))
+        self.hint_rect = self.hint.get_rect(center=(pw // 2, ph - 14))
+
+    def _build_background(self):
+        pw, ph = self.pixel_size
+        surf = self.surface.copy()
+        # Background gradient sky
+        surf.fill((40, 40, 75))
+        for i in range(ph // 2):
+            c = 75 + i // 2
+            pygame.draw.line(surf, (c, 160, 220), (0, i), (pw, i))
+        # Silhouette hills
+        pygame.draw.rect(surf, (20, 35, 60), (0, ph - 40, pw, 40))
+        pygame.draw.rect(surf, (15, 25, 45), (0, ph - 28, pw, 28))
+        return surf
+
+    def update(self):
+        """Move stars slowly left; wrapped stars come back at a random height."""
+        self.tick += 1
+        pw, ph = self.pixel_size
+        self.star_x -= np.where(self.star_y % 3 == 0, 2, 1)
+        wrapped = self.star_x < 0
+        count = int(wrapped.sum())
+        if count:
+            self.star_x[wrapped] = pw - 1
+            self.star_y[wrapped] = self.rng.integers(0, ph // 2, count)
+
+    def draw(self):
+        surf = self.surface
+        surf.blit(self.background, (0, 0))
+        # Starfield
+        pixels = pygame.surfarray.pixels2d(surf)
+        pixels[self.star_x, self.star_y] = self.star_color
+        del pixels  # unlock the surface
+
+        surf.blit(self.title, self.title_rect)
+        # Simple blinking
+        if (self.tick // 30) % 2 == 0:
+            surf.blit(self.prompt, self.prompt_rect)
+        surf.blit(self.hint, self.hint_rect)
+
+        # Scale up into the screen with nearest-neighbor
+        pygame.transform.scale(surf, self.screen.get_size(), self.screen)
@@ -0,0 +1,148 @@
+import heapq
+
+import numpy as np
+from settings import *
+
+WALK, JUMP, DROP = 0, 1, 2
+
+
+def jump_height(power=ENEMY_JUMP_POWER, gravity=GRAVITY):
+    """How far a jump lifts a body with the physics step's integration."""
+    rise, vy = 0.0, float(power)
+    while True:
+        vy += gravity
+        if vy >= 0:
+            return rise
+        rise -= vy
+
+
+class NavGraph:
+    """Where a walker can go in the loaded part of a level, built from its
+    platform layout.
+
+    The graph only covers `span` (the x range whose chunks are loaded), so
+    its size and build cost follow the visible area, not the level width.
+    Every walkable surface (the ground across the span and each platform top) is cut into
+    NAV_CELL wide nodes. Neighbouring nodes on a surface are walk links;
+    the end nodes of a platform have drop links to the surface below, and
+    nodes with a higher surface within jump height and NAV_JUMP_REACH get
+    jump links up to it.
+
+    One flow field toward a target node is kept: for every node, which way
+    to walk and whether to jump to get closer. It is only recomputed when
+    the target moves to another node, and every orc just reads it, so the
+    cost does not grow with the number of orcs.
+    """
+    def __init__(self, ground_y, span, platform_rects, cell=NAV_CELL):
+        self.cell = cell
+        surfaces = [(span[0], span[1], ground_y)]
+        surfaces += [(r.left, r.right, r.top) for r in platform_rects]
+        self.surfaces = np.array(surfaces, dtype=float).reshape(-1, 3)
+
+        # nodes
+        counts = np.maximum(1, np.ceil((self.surfaces[:, 1] - self.surfaces[:, 0]) / cell)).astype(int)
+        self.first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        self.counts = counts
+        surface_of = np.repeat(np.arange(len(surfaces)), counts)
+        local = np.arange(counts.sum()) - self.first[surface_of]
+        left, right, top = self.surfaces[surface_of].T
+        self.node_surface = surface_of
+        self.node_x = np.minimum(left + (local + 0.5) * cell, right)
+        self.node_y = top
+
+        self.edges = self._build_edges()
+        self._reverse = [[] for _ in range(len(self.node_x))]
+        for (a, b), (cost, _) in self.edges.items():
+            self._reverse[b].append((a, cost))
+
+        self.target = -1
+        self.flow_dir = np.zeros(len(self.node_x), dtype=np.int8)
+        self.flow_jump = np.zeros(len(self.node_x), dtype=bool)
+        self.reachable = np.zeros(len(self.node_x), dtype=bool)
+
+    def __len__(self):
+        return len(self.node_x)
+
+    # ----------------------------------------------------------------------
+    def _build_edges(self):
+        """{(from, to): (cost, kind)} for walk, drop and jump links."""
+        edges = {}
+        cell = self.cell
+        for s, (first, count) in enumerate(zip(self.first.tolist(), self.counts.tolist())):
+            for a in range(first, first + count - 1):
+                edges[(a, a + 1)] = edges[(a + 1, a)] = (cell, WALK)
+            if s == 0:
+                continue  # the ground spans the whole graph
+            left, right, top = self.surfaces[s]
+            for node, x in ((first, left - cell / 2), (first + count - 1, right + cell / 2)):
+                below = self.locate_below(x, top)
+                if below >= 0:
+                    edges[(node, below)] = (cell + (self.node_y[below] - top) / 2, DROP)
+
+        # jump links to any node of a higher surface within reach
+        max_rise = jump_height() - 1
+        order = np.argsort(self.node_x, kind="stable")
+        xs = self.node_x[order]
+        for a in range(len(self.node_x)):
+            lo = np.searchsorted(xs, self.node_x[a] - NAV_JUMP_REACH, "left")
+            hi = np.searchsorted(xs, self.node_x[a] + NAV_JUMP_REACH, "right")
+            near = order[lo:hi]
+            rise = self.node_y[a] - self.node_y[near]
+            for b in near[(rise > 0) & (rise <= max_rise)].tolist():
+                if (a, b) not in edges:
+                    edges[(a, b)] = (2 * cell + self.node_y[a] - self.node_y[b], JUMP)
+        return edges
+
+    def locate_below(self, x, y):
+        """Node of the highest surface under (x, y), or -1."""
+        s = self.surfaces
+        under = (s[:, 0] <= x) & (x < s[:, 1]) & (s[:, 2] > y)
+        if not under.any():
+            return -1
+        candidates = np.flatnonzero(under)
+        surface = candidates[s[candidates, 2].argmin()]
+        return self._node_on(surface, x)
+
+    def _node_on(self, surface, x):
+        local = int((x - self.surfaces[surface, 0]) // self.cell)
+        return int(self.first[surface] + min(max(local, 0), self.counts[surface] - 1))
+
+    def locate(self, x, bottom):
+        """Nodes under feet at (x, bottom) for arrays of walkers; -1 when not standing on a surface."""
+        x = np.asarray(x, dtype=float)
+        bottom = np.asarray(bottom, dtype=float)
+        s = self.surfaces
+        on = (np.abs(s[:, 2] - bottom[:, None]) < 2) & (s[:, 0] <= x[:, None]) & (x[:, None] < s[:, 1])
+        found = on.any(axis=1)
+        surface = on.argmax(axis=1)
+        local = np.clip((x - s[surface, 0]) // self.cell, 0, self.counts[surface] - 1).astype(int)
+        return np.where(found, self.first[surface] + local, -1)
+
+    # ----------------------------------------------------------------------
+    def set_target(self, node):
+        """Point the flow field at a node; only recomputed when it changed."""
+        if node == self.target or node < 0:
+            return
+        self.target = node
+        n = len(self.node_x)
+        dist = np.full(n, np.inf)
+        step_to = np.full(n, -1)
+        dist[node] = 0.0
+        heap = [(0.0, node)]
+        while heap:
+            d, b = heapq.heappop(heap)
+            if d > dist[b]:
+                continue
+            for a, cost in self._reverse[b]:
+                if d + cost < dist[a]:
+                    dist[a] = d + cost
+                    step_to[a] = b
+                    heapq.heappush(heap, (d + cost, a))
+
+        self.reachable = np.isfinite(dist)
+        self.flow_dir[:] = 0
+        self.flow_jump[:] = False
+        for a in np.flatnonzero(step_to >= 0).tolist():
+            b = int(step_to[a])
+            self.flow_dir[a] = np.sign(self.node_x[b] - self.node_x[a])
+            self.flow_jump[a] = self.edges[(a, b)][1] == JUMP
@@ -0,0 +1,202 @@
+import numpy as np
+import pygame
+from settings import *
+
+# per-body columns: name -> (row shape, dtype)
+COLUMNS = {
+    "pos": ((2,), float),        # box topleft
+    "size": ((2,), float),
+    "offset": ((2,), float),     # box topleft inside the sprite rect
+    "vel": ((2,), float),
+    "on_ground": ((), bool),
+}
+
+
+class PhysicsWorld:
+    """Kinematic bodies of one level, integrated together in one NumPy pass.
+
+    A body is an axis-aligned box fixed to a sprite (e.g. the character's
+    body inside its 300x300 frame). Every step gravity is added, boxes move
+    by their velocity and falling boxes are swept against platform tops and
+    the ground, so even a fast fall cannot pass through a platform.
+    Platforms are one-way: bodies jump up through them and land on top.
+    Bodies outside the streamed-in part of the level sleep until their
+    platforms are loaded.
+
+    The body arrays are views of the first len(self) rows of columns that
+    double when full, so adding a body only writes one row; removing one
+    moves the last body into its row.
+    """
+    def __init__(self, ground_y, world_width):
+        self.ground_y = ground_y
+        self.world_width = world_width
+        self.active_span = (0, world_width)  # x range whose platforms are loaded
+        self.owners = []
+        self.index = {}  # owner -> row
+        self._columns = {}
+        self._allocate(0)
+
+        self._platforms = {}  # platform -> (left, right, top)
+        self._tops = np.zeros((0, 3))
+        self._tops_dirty = False
+
+    def _allocate(self, capacity, keep=0):
+        """New columns with room for `capacity` bodies; the first `keep` rows are copied over."""
+        old = self._columns
+        self._columns = {name: np.zeros((capacity, *shape), dtype) for name, (shape, dtype) in COLUMNS.items()}
+        for name, column in old.items():
+            self._columns[name][:keep] = column[:keep]
+        self._use(keep)
+
+    def _use(self, n):
+        """Point the body arrays at the first n rows."""
+        for name, column in self._columns.items():
+            setattr(self, name, column[:n])
+
+    def __len__(self):
+        return len(self.owners)
+
+    def __contains__(self, owner):
+        return owner in self.index
+
+    # ----------------------------------------------------------------------
+    def add(self, owner, body):
+        """Attach a box (Rect local to owner.rect) to a sprite."""
+        row = len(self.owners)
+        if row == len(self._columns["pos"]):
+            self._allocate(max(16, 2 * row), keep=row)
+        self.index[owner] = row
+        self.owners.append(owner)
+        columns = self._columns
+        columns["pos"][row] = (owner.rect.x + body.x, owner.rect.y + body.y)
+        columns["size"][row] = body.size
+        columns["offset"][row] = body.topleft
+        columns["vel"][row] = 0.0
+        columns["on_ground"][row] = False
+        self._use(row + 1)
+
+    def remove(self, owner):
+        row = self.index.pop(owner, None)
+        if row is None:
+            return
+        last = len(self.owners) - 1
+        if row != last:
+            moved = self.owners[row] = self.owners[last]
+            self.index[moved] = row
+            for column in self._columns.values():
+                column[row] = column[last]
+        self.owners.pop()
+        self._use(last)
+
+    def ids(self, owners):
+        return np.fromiter((self.index[o] for o in owners), dtype=np.intp, count=len(owners))
+
+    def add_platform(self, platform):
+        r = platform.rect
+        self._platforms[platform] = (r.left, r.right, r.top)
+        self._tops_dirty = True
+
+    def remove_platform(self, platform):
+        if self._platforms.pop(platform, None) is not None:
+            self._tops_dirty = True
+
+    def snapshot(self):
+        """Copy of every body (platforms belong to the level and are left out)."""
+        return (tuple(self.owners), self.pos.copy(), self.size.copy(), self.offset.copy(),
+                self.vel.copy(), self.on_ground.copy())
+
+    def restore(self, snapshot):
+        """Put the bodies back as they were; the sprite rects follow."""
+        owners, pos, size, offset, vel, on_ground = snapshot
+        self.owners = list(owners)
+        self.index = {owner: i for i, owner in enumerate(self.owners)}
+        n = len(self.owners)
+        if n > len(self._columns["pos"]):
+            self._allocate(n)
+        for name, values in zip(COLUMNS, (pos, size, offset, vel, on_ground)):
+            self._columns[name][:n] = values
+        self._use(n)
+        topleft = np.rint(self.pos - self.offset).astype(int).tolist()
+        for owner, xy in zip(self.owners, topleft):
+            owner.rect.topleft = xy
+
+    # ----------------------------------------------------------------------
+    def drive(self, owner, vx, jump_speed=0):
+        """Set one body's walking speed; jump if it stands on something."""
+        i = self.index[owner]
+        self.vel[i, 0] = vx
+        if jump_speed and self.on_ground[i]:
+            self.vel[i, 1] = jump_speed
+            self.on_ground[i] = False
+
+    def drive_many(self, ids, vx):
+        self.vel[ids, 0] = vx
+
+    def jump_many(self, ids, jump_speed):
+        """Make the grounded ones among the bodies jump."""
+        ids = ids[self.on_ground[ids]]
+        self.vel[ids, 1] = jump_speed
+        self.on_ground[ids] = False
+
+    def grounded(self, owner):
+        return bool(self.on_ground[self.index[owner]])
+
+    def box(self, owner):
+        i = self.index[owner]
+        return pygame.Rect(round(self.pos[i, 0]), round(self.pos[i, 1]), *self.size[i])
+
+    def sprite_pos(self, ids):
+        """Sprite rect topleft of bodies, unrounded."""
+        return self.pos[ids] - self.offset[ids]
+
+    def step(self):
+        """Advance every awake body one tick; returns the owners that were moved."""
+        if not self.owners:
+            return []
+        if self._tops_dirty:
+            self._tops = np.array(list(self._platforms.values()), dtype=float).reshape(-1, 3)
+            self._tops_dirty = False
+
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        w, h = self.size[:, 0], self.size[:, 1]
+        left, right = self.active_span
+        awake = (x + w > left) & (x < right)
+
+        vel = self.vel
+        vel[awake, 1] = np.minimum(vel[awake, 1] + GRAVITY, MAX_FALL_SPEED)
+        vx = np.where(awake, vel[:, 0], 0.0)
+        vy = np.where(awake, vel[:, 1], 0.0)
+
+        # swept test of each falling box's bottom edge against every platform top
+        bottom = y + h
+        land = np.where(bottom + vy >= self.ground_y, float(self.ground_y), np.inf)
+        falling = awake & (vy > 0)
+        if len(self._tops) and falling.any():
+            rows = np.flatnonzero(falling)
+            p_left, p_right, p_top = self._tops[:, 0], self._tops[:, 1], self._tops[:, 2]
+            b0 = bottom[rows, None]
+            fall = vy[rows, None]
+            crosses = (b0 <= p_top + 0.01) & (b0 + fall >= p_top)
+            t = np.clip((p_top - b0) / fall, 0.0, 1.0)
+            x_at = x[rows, None] + vx[rows, None] * t
+            hit = crosses & (x_at < p_right) & (x_at + w[rows, None] > p_left)
+            tops = np.where(hit, p_top, np.inf).min(axis=1)
+            land[rows] = np.minimum(land[rows], tops)
+
+        landed = awake & (vy >= 0) & np.isfinite(land)
+        new_y = np.where(landed, land - h, y + vy)
+        new_x = np.clip(x + vx, 0, self.world_width - w)
+        self.pos[:, 0] = new_x
+        self.pos[:, 1] = new_y
+        vel[landed, 1] = 0.0
+        self.on_ground[awake] = landed[awake]
+
+        # sprites follow their boxes
+        rows = np.flatnonzero(awake)
+        topleft = np.rint(self.pos[rows] - self.offset[rows]).astype(int).tolist()
+        moved = []
+        for i, (sx, sy) in zip(rows.tolist(), topleft):
+            owner = self.owners[i]
+            owner.rect.topleft = (sx, sy)
+            moved.append(owner)
+        return moved
@@ -1,16 +1,28 @@
 import pygame
 from settings import *
+from animation import atlas
+from collision import mask_table
+from utils import get_font, render_text
+from audio import sound_bank
+from memory import memory
+import game_clock
 
-# saving frames for different actions
+# sprite sheets for different actions, loaded by the atlas on first use
 animation_soldier={
-    "walk": pygame.image.load("Photo/Soldier/Soldier_Walk.png"),
-    "idle": pygame.image.load("Photo/Soldier/Soldier_Idle.png"),
-    "attack": pygame.image.load("Photo/Soldier/Soldier_Attack01.png"),
-    "death": pygame.image.load("Photo/Soldier/Soldier_Death.png"),
-    "hit": pygame.image.load("Photo/Soldier/Soldier_Hit.png")
+    "walk": "Photo/Soldier/Soldier_Walk.png",
+    "idle": "Photo/Soldier/Soldier_Idle.png",
+    "attack": "Photo/Soldier/Soldier_Attack01.png",
+    "death": "Photo/Soldier/Soldier_Death.png",
+    "hit": "Photo/Soldier/Soldier_Hit.png"
 }
 
 
+# what changes while playing, copied by snapshot()
+SNAPSHOT_FIELDS = ("state", "frames", "current_frame", "image", "mask", "last_update", "alive",
+                   "side_left", "move_x", "want_jump", "on_ground", "health", "attacking", "swing",
+                   "last_damage_time")
+
+
 class Player(pygame.sprite.Sprite):
     #initalize player
     def __init__(self, x, y, health, attack_damage, speed, scale):
@@ -23,45 +35,40 @@ class Player(pygame.sprite.Sprite):
         self.current_frame=0
         self.image=self.frames[self.current_frame]
         self.scale(scale)
-        self.mask=pygame.mask.from_surface(self.image, 0)
+        self.mask=mask_table.masks(self.animations[self.state], scale)[self.current_frame]
         self.rect=self.image.get_rect(topleft=(x, y))
-        self.last_update=pygame.time.get_ticks()
+        self.last_update=game_clock.get_ticks()
         self.alive=True
         self.speed=speed
         self.side_left=False
         self.scales=scale
+        # physics body and this tick's movement intent (level.physics moves the rect)
+        self.body=mask_table.body(self.animations["idle"], scale)
+        self.move_x=0
+        self.want_jump=False
+        self.on_ground=False
         
         # ADDED: Health tracking variables
         self.max_health=health
         self.health=health
         self.attack_damage=attack_damage
         self.attacking = False
+        self.team = "player"
+        self.swing = 0  # counts attacks, each one hits a target at most once
+        # cached HUD health bar
+        self.hud = None
+        self.hud_health = None
         
-        # ADDED: Attack hitbox variables
-        self.attack_rect = None
         self.last_damage_time = 0
-        self.damage_cooldown = 800  # ms between damage to same enemy
 
-
-        # Load sounds
-        self.hit = pygame.mixer.Sound("Audio/player_hit1.mp3")  
-        self.hit.set_volume(0.3)
     
     # magnify size of player    
     def scale(self, scale):
         self.image=pygame.transform.scale(self.image, (scale*100, scale*100))
         
-    # load frames for given action     
-    def load_frame(self, sprite_sheet, scale):
-        frames=[]
-        sheet_width=sprite_sheet.get_width()
-        num_frames=sheet_width//self.frame_width
-        for i in range(num_frames):
-            frame=pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
-            frame.blit(sprite_sheet, (0, 0), (i * self.frame_width, 0, self.frame_width, self.frame_height))
-            # pygame.transform.scale(frame, (self.scales*100, self.scales*100))
-            frames.append(pygame.transform.scale(frame, (scale*100, scale*100)))
-        return frames
+    # load frames for given action (shared through the animation atlas)
+    def load_frame(self, sprite_sheet, scale, flipped=False):
+        return atlas.get(sprite_sheet, scale, flipped)
     
     # set the new state of player 
     def set_state(self,new_state):
@@ -69,79 +76,90 @@ class Player(pygame.sprite.Sprite):
             self.state = new_state
             self.frames = self.load_frame(self.animations[self.state], self.scales)
             self.current_frame = 0
-            self.last_update = pygame.time.get_ticks()
+            self.last_update = game_clock.get_ticks()
+            if new_state == "attack":
+                self.swing += 1
     
 
-    def get_attack_rect(self):
-        if self.attacking:
-            attack_rect = pygame.Rect(self.rect.x, self.rect.y, 100, 28)
-            # attack_rect.width = 2
-            # if self.side_left:
-            #     attack_rect.right = self.rect.left 
-            # else:
-            #     attack_rect.left = self.rect.right
-                
-            return attack_rect
-        return None    
+    # visible body of the current frame in world coordinates
+    def get_body_rect(self):
+        bounds = mask_table.bounds(self.animations[self.state], self.scales, self.side_left)
+        return bounds[self.current_frame].move(self.rect.topleft)
+
+
+    # state for world snapshots; frames and images are shared, so references are enough
+    def snapshot(self):
+        return tuple(getattr(self, name) for name in SNAPSHOT_FIELDS)
+
+    def restore(self, snapshot):
+        for name, value in zip(SNAPSHOT_FIELDS, snapshot):
+            setattr(self, name, value)
 
 
     # ADDED: Take damage from enemy
     def take_damage(self, damage):
-        now = pygame.time.get_ticks()
-        if now - self.last_damage_time > self.damage_cooldown:
-            self.health -= damage
-            self.last_damage_time = now
-            if self.health <= 0:
-                self.health = 0
-                self.alive = False
-                quit()
+        self.health -= damage
+        self.last_damage_time = game_clock.get_ticks()
+        if self.health <= 0:
+            self.health = 0
+            self.alive = False
                 
     
     
-    # ADDED: Draw health bar on screen
-    def draw_health_bar(self, screen):
+    # ADDED: Health bar for the HUD
+    def health_bar(self):
+        # only recomposed when health changes
+        if self.hud is None or self.hud_health != self.health:
+            self.hud = self.build_health_bar()
+            self.hud_health = self.health
+        return self.hud
+
+    def build_health_bar(self):
         bar_width = 200
         bar_height = 20
-        x = 20
-        y = 50
+        bar = pygame.Surface((bar_width, bar_height))
         
         # Background (dark red)
-        pygame.draw.rect(screen, (100, 0, 0), (x, y, bar_width, bar_height))
+        bar.fill((100, 0, 0))
         
         # Health (green)
         health_ratio = self.health / self.max_health
         
-        pygame.draw.rect(screen, (0, 200, 0), (x, y, bar_width * health_ratio, bar_height))
+        pygame.draw.rect(bar, (0, 200, 0), (0, 0, bar_width * health_ratio, bar_height))
         
         # Border
-        pygame.draw.rect(screen, WHITE, (x, y, bar_width, bar_height), 2)
+        pygame.draw.rect(bar, WHITE, (0, 0, bar_width, bar_height), 2)
         
         # Text
-        font = pygame.font.Font(None, 16)
-        text = font.render(f"Player HP: {(self.health)}/{(self.max_health)}", True, WHITE)
-        # text = font.render("HP", True, WHITE)
-        screen.blit(text, (x + 10, y + 2))
+        text = render_text(get_font(16), f"Player HP: {(self.health)}/{(self.max_health)}", WHITE)
+        bar.blit(text, (10, 2))
+        return memory.track(bar, "ui")
             
-    # update the player        
-    def update(self):
+    # update the player; keys is the tick's input state (live keyboard if not given)
+    def update(self, keys=None):
         
-        self.image = pygame.transform.flip(self.frames[self.current_frame], self.side_left, False)
-        self.mask=pygame.mask.from_surface(self.image, 0)
+        sheet = self.animations[self.state]
+        self.image = self.load_frame(sheet, self.scales, self.side_left)[self.current_frame]
+        self.mask = mask_table.masks(sheet, self.scales, self.side_left)[self.current_frame]
         
         # handling the key inputs for player
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        self.move_x = 0
+        self.want_jump = False
         if not self.attacking:
+            self.want_jump = keys[pygame.K_w] or keys[pygame.K_UP]
             if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-                self.rect.x += self.speed
+                self.move_x = self.speed
                 self.side_left=False
                 self.set_state("walk")
             elif keys[pygame.K_a] or keys[pygame.K_LEFT]:
-                self.rect.x -= self.speed
+                self.move_x = -self.speed
                 self.side_left=True
                 self.set_state("walk")
             elif keys[pygame.K_SPACE]:
                 self.set_state("attack")
-                self.hit.play()
+                sound_bank.play("player_hit")
                 self.attacking = True
             else:
                 self.set_state("idle")
@@ -149,8 +167,8 @@ class Player(pygame.sprite.Sprite):
 
         
         # setting the player state
-        now = pygame.time.get_ticks()
-        if now - self.last_update >=FPS:
+        now = game_clock.get_ticks()
+        if now - self.last_update >= ANIMATION_FRAME_MS:
             self.last_update = now
             self.current_frame += 1
             if self.current_frame >= len(self.frames):
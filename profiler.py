@@ -0,0 +1,143 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+from settings import *
+from utils import render_text
+
+FRAME_BUDGET_MS = 1000 / FPS  # 16.6ms at 60 FPS
+
+
+class RingBuffer:
+    """Fixed-size float buffer that overwrites its oldest samples."""
+    def __init__(self, size):
+        self.data = np.zeros(size)
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+
+    def values(self):
+        """Samples oldest to newest."""
+        if self.count < len(self.data):
+            return self.data[:self.count]
+        return np.roll(self.data, -self.index)
+
+    def percentiles(self, qs=(50, 95, 99)):
+        if self.count == 0:
+            return [0.0 for _ in qs]
+        return np.percentile(self.data[:self.count], qs).tolist()
+
+
+class FrameProfiler:
+    """Per-phase timings of the game loop kept in ring buffers.
+
+    Wrap code in `with profiler.phase("name"):` and call end_frame() once per
+    rendered frame. The overlay shows p50/p95/p99 per phase and a frame-time graph.
+    """
+    def __init__(self, size=300):
+        self.size = size
+        self.phases = {}
+        self.frames = RingBuffer(size)
+        self.visible = False
+        self._frame_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, ms):
+        buf = self.phases.get(name)
+        if buf is None:
+            buf = self.phases[name] = RingBuffer(self.size)
+        buf.append(ms)
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.frames.append((now - self._frame_start) * 1000)
+        self._frame_start = now
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def summary(self):
+        out = {"frame": dict(zip(("p50", "p95", "p99"), self.frames.percentiles()))}
+        for name, buf in self.phases.items():
+            out[name] = dict(zip(("p50", "p95", "p99"), buf.percentiles()))
+        return out
+
+    # ----------------------------------------------------------------------
+    def draw(self, surface, font, extra_lines=()):
+        """Overlay with one p50/p95/p99 bar row per phase and a frame graph."""
+        if not self.visible:
+            return
+        rows = [("frame", self.frames)] + sorted(self.phases.items())
+        row_h = 16
+        bar_x, bar_w = 250, 180
+        columns = (125, 170, 210)
+        panel = pygame.Rect(SCREEN_WIDTH - 460, 90, 440, 140 + row_h * (len(rows) + len(extra_lines)))
+        overlay = pygame.Surface(panel.size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+
+        y = 8
+        for line in extra_lines:
+            overlay.blit(font.render(line, True, WHITE), (8, y))
+            y += row_h
+        for label, x in zip(("p50", "p95", "p99"), columns):
+            overlay.blit(render_text(font, label, GRAY), (x, y))
+        y += row_h
+        top = y
+        scale = bar_w / (2 * FRAME_BUDGET_MS)
+        budget_x = bar_x + int(FRAME_BUDGET_MS * scale)
+        for name, buf in rows:
+            values = buf.percentiles()
+            overlay.blit(render_text(font, name, WHITE), (8, y))
+            for value, x in zip(values, columns):
+                overlay.blit(font.render(f"{value:.2f}", True, WHITE), (x, y))
+            # p99 behind p95 behind p50
+            for value, color in zip(reversed(values), ((200, 60, 60), (220, 180, 60), (60, 200, 60))):
+                pygame.draw.rect(overlay, color, (bar_x, y + 3, min(bar_w, value * scale), 10))
+            y += row_h
+        pygame.draw.line(overlay, WHITE, (budget_x, top), (budget_x, y), 1)
+
+        # frame-time graph, budget line in the middle
+        graph = pygame.Rect(8, y + 8, panel.width - 16, 100)
+        pygame.draw.rect(overlay, (30, 30, 30, 200), graph)
+        values = self.frames.values()
+        if len(values):
+            step = graph.width / self.size
+            heights = np.minimum(values / (2 * FRAME_BUDGET_MS), 1.0) * graph.height
+            for i, (ms, h) in enumerate(zip(values.tolist(), heights.tolist())):
+                x = graph.x + int(i * step)
+                color = (60, 200, 60) if ms <= FRAME_BUDGET_MS else (220, 60, 60)
+                pygame.draw.line(overlay, color, (x, graph.bottom), (x, graph.bottom - h))
+        pygame.draw.line(overlay, WHITE, (graph.x, graph.centery), (graph.right, graph.centery))
+        surface.blit(overlay, panel)
+
+    # ----------------------------------------------------------------------
+    def dump(self, basename="frame_profile"):
+        """Write raw samples to <basename>.csv and percentiles + samples to <basename>.json."""
+        series = {"frame": self.frames.values()}
+        series.update((name, buf.values()) for name, buf in self.phases.items())
+        with open(basename + ".json", "w") as f:
+            json.dump({
+                "budget_ms": FRAME_BUDGET_MS,
+                "summary": self.summary(),
+                "samples": {name: values.tolist() for name, values in series.items()},
+            }, f, indent=2)
+        with open(basename + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "sample", "ms"])
+            for name, values in series.items():
+                for i, ms in enumerate(values.tolist()):
+                    writer.writerow([name, i, f"{ms:.4f}"])
@@ -0,0 +1,69 @@
+import numpy as np
+from resolution import scaled
+
+# layers, drawn back to front
+BACKGROUND, WORLD, SPRITES, OVERLAY = range(4)
+
+
+class RenderQueue:
+    """Drawables of one frame, submitted layer by layer with one blits() call each.
+
+    Positions are in world pixels and `parallax` is how much of the camera's
+    movement an item follows (1 for the world, 0 for anything fixed to the
+    view). flush() applies the camera and the render scale to every queued
+    item in one NumPy pass, culls what falls outside the target, sorts each
+    layer by z (stable, so equal z keeps submission order) and blits the rest.
+    """
+    def __init__(self):
+        self._batches = []  # (layer, surfaces, positions, sizes, z, parallax)
+
+    def __len__(self):
+        return sum(len(batch[1]) for batch in self._batches)
+
+    def add(self, surface, pos, layer=SPRITES, z=0, parallax=1.0):
+        self.add_many([surface], [pos], [surface.get_size()], layer, z, parallax)
+
+    def add_many(self, surfaces, positions, sizes, layer=SPRITES, z=0, parallax=1.0):
+        """Queue surfaces at world positions; sizes are their unscaled sizes (for culling)."""
+        n = len(surfaces)
+        if not n:
+            return
+        self._batches.append((
+            layer,
+            list(surfaces),
+            np.asarray(positions, dtype=float).reshape(n, 2),
+            np.asarray(sizes, dtype=float).reshape(n, 2),
+            np.broadcast_to(np.asarray(z, dtype=float), (n,)),
+            parallax,
+        ))
+
+    def clear(self):
+        self._batches.clear()
+
+    def flush(self, target, camera_x=0, scale=1):
+        """Draw everything queued into target and empty the queue; returns the blit count."""
+        batches, self._batches = self._batches, []
+        view_w, view_h = target.get_size()
+        drawn = 0
+        for layer in sorted({batch[0] for batch in batches}):
+            group = [batch for batch in batches if batch[0] == layer]
+            surfaces = [surface for batch in group for surface in batch[1]]
+            pos = np.concatenate([batch[2] for batch in group])
+            size = np.concatenate([batch[3] for batch in group])
+            z = np.concatenate([batch[4] for batch in group])
+            follow = np.concatenate([np.full(len(batch[1]), batch[5]) for batch in group])
+
+            # camera transform, then cull against the target
+            pos[:, 0] -= camera_x * follow
+            screen = np.floor(pos * scale)
+            extent = np.ceil(size * scale)
+            visible = ((screen[:, 0] < view_w) & (screen[:, 1] < view_h)
+                       & (screen[:, 0] + extent[:, 0] > 0) & (screen[:, 1] + extent[:, 1] > 0))
+            order = np.flatnonzero(visible)
+            order = order[np.argsort(z[order], kind="stable")].tolist()
+            if not order:
+                continue
+            topleft = screen.astype(int).tolist()
+            target.blits([(scaled(surfaces[i], scale), topleft[i]) for i in order], doreturn=False)
+            drawn += len(order)
+        return drawn
@@ -0,0 +1,197 @@
+"""Input sources, recording and replay.
+
+The game reads its input once per simulation tick from an input source:
+the held game keys as a bitmask plus the key presses of that tick. Live play
+polls pygame; a Recorder wraps the live source and saves what it saw, and a
+ReplayInput feeds a saved session back tick by tick. The simulation only
+depends on that input and the seed, so a replay reproduces the session.
+
+Replay file:
+
+    header   magic, version, seed, tick count
+    records  only for ticks where something changed:
+             ticks since the previous record, key mask, event count, events
+    event    kind (key press / quit), key, unicode text
+
+Numbers are stored as variable-length integers, so an idle stretch of play
+costs nothing and a key change costs a few bytes.
+"""
+import struct
+
+import pygame
+
+MAGIC = b"RPL1"
+VERSION = 1
+HEADER = struct.Struct("<4sHQI")  # magic, version, seed, ticks
+
+# keys the simulation reads while playing; bit i of the mask is GAME_KEYS[i]
+GAME_KEYS = (pygame.K_a, pygame.K_d, pygame.K_LEFT, pygame.K_RIGHT,
+             pygame.K_SPACE, pygame.K_w, pygame.K_UP)
+_KEY_BITS = {key: 1 << i for i, key in enumerate(GAME_KEYS)}
+
+KEY_PRESS, QUIT = 0, 1
+
+
+class InputState:
+    """Held game keys of one tick; indexable like pygame.key.get_pressed()."""
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, pressed):
+        mask = 0
+        for key, bit in _KEY_BITS.items():
+            if pressed[key]:
+                mask |= bit
+        return cls(mask)
+
+    def __getitem__(self, key):
+        return bool(self.mask & _KEY_BITS.get(key, 0))
+
+
+class LiveInput:
+    """Keyboard and window events from pygame."""
+    def __init__(self):
+        self.keys = InputState()
+        self.events = []
+        self.finished = False
+
+    def poll(self):
+        self.keys = InputState.from_pressed(pygame.key.get_pressed())
+        self.events = pygame.event.get()
+
+
+class Recorder:
+    """Wraps an input source and records every tick it hands out."""
+    def __init__(self, source, path, seed):
+        self.source = source
+        self.path = path
+        self.seed = seed
+        self.ticks = 0
+        self.records = []  # (tick, mask, events)
+        self._last_mask = 0
+
+    @property
+    def keys(self):
+        return self.source.keys
+
+    @property
+    def events(self):
+        return self.source.events
+
+    @property
+    def finished(self):
+        return self.source.finished
+
+    def poll(self):
+        self.source.poll()
+        mask = self.source.keys.mask
+        events = [e for e in self.source.events if e.type in (pygame.KEYDOWN, pygame.QUIT)]
+        if mask != self._last_mask or events:
+            self.records.append((self.ticks, mask, events))
+            self._last_mask = mask
+        self.ticks += 1
+
+    def save(self):
+        with open(self.path, "wb") as f:
+            f.write(encode(self.seed, self.ticks, self.records))
+
+
+class ReplayInput:
+    """Plays a recorded session back, one tick per poll(). When watched in a
+    window, closing the window still quits."""
+    def __init__(self, path, watch=False):
+        with open(path, "rb") as f:
+            self.seed, self.ticks, self.records = decode(f.read())
+        self.watch = watch
+        self.tick = 0
+        self.keys = InputState()
+        self.events = []
+        self._next = 0
+
+    @property
+    def finished(self):
+        return self.tick >= self.ticks
+
+    def poll(self):
+        self.events = []
+        if self._next < len(self.records) and self.records[self._next][0] == self.tick:
+            _, mask, self.events = self.records[self._next]
+            self.keys = InputState(mask)
+            self._next += 1
+        if self.finished:
+            # past the end of the recording nothing is held
+            self.keys = InputState()
+        if self.watch:
+            self.events = self.events + pygame.event.get(pygame.QUIT)
+        self.tick += 1
+
+
+# ----------------------------------------------------------------------
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf, pos):
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode(seed, ticks, records):
+    out = bytearray(HEADER.pack(MAGIC, VERSION, seed, ticks))
+    last_tick = 0
+    for tick, mask, events in records:
+        _write_varint(out, tick - last_tick)
+        _write_varint(out, mask)
+        _write_varint(out, len(events))
+        for event in events:
+            if event.type == pygame.QUIT:
+                out.append(QUIT)
+                continue
+            text = event.unicode.encode("utf-8")
+            out.append(KEY_PRESS)
+            _write_varint(out, event.key)
+            _write_varint(out, len(text))
+            out += text
+        last_tick = tick
+    return bytes(out)
+
+
+def decode(data):
+    """(seed, tick count, records) of an encoded replay."""
+    magic, version, seed, ticks = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} replay")
+    records = []
+    pos = HEADER.size
+    tick = 0
+    while pos < len(data):
+        delta, pos = _read_varint(data, pos)
+        mask, pos = _read_varint(data, pos)
+        count, pos = _read_varint(data, pos)
+        tick += delta
+        events = []
+        for _ in range(count):
+            kind = data[pos]
+            pos += 1
+            if kind == QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+                continue
+            key, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            text = data[pos:pos + length].decode("utf-8")
+            pos += length
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=text, mod=0, scancode=0))
+        records.append((tick, mask, events))
+    return seed, ticks, records
@@ -0,0 +1,114 @@
+import math
+import weakref
+
+import pygame
+from settings import *
+from profiler import FRAME_BUDGET_MS
+from memory import memory
+
+HEADROOM = 0.8  # go back up only if the sharper scale is expected to stay under this share of the budget
+
+_scaled = weakref.WeakKeyDictionary()  # surface -> {scale: scaled copy}
+
+
+def scaled(surface, scale):
+    """Surface scaled by a factor, cached until the original is gone.
+
+    The copy keeps the original's colorkey and alpha, so level chunks and
+    fading sprites draw the same at any scale; the alpha is checked on every
+    lookup since a fading sprite changes it on the same surface. Sizes round
+    up, so tiles placed edge to edge never leave a gap.
+    """
+    if scale == 1:
+        return surface
+    copies = _scaled.get(surface)
+    if copies is None:
+        copies = _scaled[surface] = {}
+    copy = copies.get(scale)
+    if copy is None:
+        w, h = surface.get_size()
+        copy = copies[scale] = pygame.transform.scale(surface, (math.ceil(w * scale), math.ceil(h * scale)))
+        memory.track(copy, "render")
+    else:
+        alpha = surface.get_alpha()
+        if copy.get_alpha() != alpha:
+            copy.set_alpha(alpha)
+    return copy
+
+
+def clear_scaled(nbytes=None):
+    """Forget every scaled copy; they are rebuilt as they are drawn."""
+    _scaled.clear()
+
+
+memory.set_evictor("render", clear_scaled)
+
+
+class DynamicResolution:
+    """World render target whose resolution follows the frame time.
+
+    The world (backgrounds, level chunks and sprites) is drawn into `target`
+    at `scale` times the screen size, then present() scales it up into the
+    screen once per frame and the HUD is drawn on top at full resolution. At
+    scale 1 the target is the screen itself and nothing is scaled.
+
+    record() gets the work time of every frame (simulation and drawing,
+    without the frame-cap sleep). Averaged over a window, a frame over budget
+    moves to the next lower scale; when the next sharper scale is expected to
+    fit (work grows with the pixel count), it moves back up.
+    """
+    def __init__(self, screen, scales=RENDER_SCALES, auto=DYNAMIC_RESOLUTION,
+                 budget_ms=FRAME_BUDGET_MS, window=30):
+        self.screen = screen
+        self.scales = scales
+        self.auto = auto
+        self.budget_ms = budget_ms
+        self.window = window
+        self._samples = []
+        self._targets = {}
+        self.level = 0
+        self.scale = scales[0]
+        self.target = screen
+
+    def set_scale(self, scale):
+        """Render the world at a scale (not necessarily one of the ladder's)."""
+        self.scale = scale
+        if scale in self.scales:
+            self.level = self.scales.index(scale)
+        if scale == 1:
+            self.target = self.screen
+            return
+        target = self._targets.get(scale)
+        if target is None:
+            w, h = self.screen.get_size()
+            # same pixel format as the screen so the upscale writes into it directly
+            target = pygame.Surface((round(w * scale), round(h * scale)), 0, self.screen)
+            self._targets[scale] = memory.track(target, "render")
+        self.target = target
+
+    def fix(self, scale):
+        """Stay at one scale; the frame time is no longer followed."""
+        self.auto = False
+        self.set_scale(scale)
+
+    def present(self):
+        """Scale the world target up into the screen."""
+        if self.target is not self.screen:
+            pygame.transform.scale(self.target, self.screen.get_size(), self.screen)
+
+    def record(self, work_ms):
+        if not self.auto:
+            return
+        self._samples.append(work_ms)
+        if len(self._samples) < self.window:
+            return
+        average = sum(self._samples) / len(self._samples)
+        self._samples.clear()
+
+        if average > self.budget_ms and self.level < len(self.scales) - 1:
+            self.set_scale(self.scales[self.level + 1])
+        elif self.level > 0:
+            sharper = self.scales[self.level - 1]
+            expected = average * (sharper / self.scale) ** 2
+            if expected < self.budget_ms * HEADROOM:
+                self.set_scale(sharper)
@@ -3,7 +3,11 @@
 # Screen
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 800
-FPS = 60
+FPS = 60  # fixed simulation ticks per second
+TICK_MS = 1000 / FPS
+MAX_RENDER_FPS = 240  # rendering cap, independent of the simulation rate
+MAX_CATCHUP_STEPS = 5  # simulation steps allowed per rendered frame
+ANIMATION_FRAME_MS = 60  # how long each animation frame is shown
 TITLE = "Dungeon Platformer (Fresh Start)"
 
 # Colors (RGB)
@@ -32,7 +36,35 @@ ENEMY_HEIGHT = 48
 ENEMY_SPEED = 4
 ENEMY_ATTACK_DAMAGE = 0.5
 ENEMY_HEALTH = 5
+ENEMY_JUMP_POWER = -16
 # Level defaults
 GROUND_HEIGHT = 80  # ground thickness in pixels
-WORLD_WIDTH = 2000  # pixels wide, you can increase later
-TOTAL_LEVELS = 3  # change if you have more
+WORLD_WIDTH = 2000  # default width for level files that do not set one
+SPATIAL_CELL_SIZE = 128  # grid cell size of the level spatial hash
+NAV_CELL = 32  # width of a navigation node on a walkable surface
+NAV_JUMP_REACH = 96  # how far sideways an orc jumps up to another surface
+WORLD_CHUNK_WIDTH = 512  # width of level file chunks and pre-rendered world slices
+STREAM_LOAD_CHUNKS = 1  # chunks loaded ahead of the camera on each side
+STREAM_KEEP_CHUNKS = 2  # chunks kept loaded behind the camera before unloading
+CHUNK_COLORKEY = (255, 0, 255)  # transparent colour of those slices
+ASSET_CACHE_BUDGET_MB = 64  # decoded background layers kept across levels
+TEXT_CACHE_SIZE = 256  # rendered strings kept by utils.render_text
+SOUND_CHANNELS = 16  # mixer channels shared by audio.sound_bank
+TEXTURE_PACK = "assets/textures.pak"  # baked by texture_pack.py, optional
+SNAPSHOT_INTERVAL = 30  # ticks between world snapshots kept for rewinding
+SNAPSHOT_COUNT = 20  # snapshots in the rewind ring (10 s at the defaults)
+REWIND_TICKS = 2 * FPS  # how far one rewind goes back
+# memory budgets per accounting tag (see memory.py); going over evicts caches or warns
+MEMORY_BUDGETS_MB = {
+    "backgrounds": ASSET_CACHE_BUDGET_MB,
+    "characters": 96,
+    "masks": 8,
+    "world": 16,
+    "render": 32,
+    "ui": 8,
+    "audio": 32,
+}
+
+# Rendering
+RENDER_SCALES = (1.0, 0.75, 0.5)  # world render resolutions, sharpest first
+DYNAMIC_RESOLUTION = True  # lower the world resolution when frames run over budget
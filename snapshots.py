@@ -0,0 +1,66 @@
+"""World-state snapshots for instant restart and rewind.
+
+A snapshot copies what changes while a level is played: the game time,
+camera, player, orcs (their AI arrays and animation state), physics bodies
+and the swings that already hit. Sprites, frames and the level itself are
+only referenced, so taking one is a few array copies and restoring one
+never loads an asset.
+"""
+from settings import *
+
+
+class WorldSnapshot:
+    __slots__ = ("level", "tick", "time_ms", "camera_x", "player", "enemies", "bodies", "combat")
+
+    def __init__(self, level, tick, time_ms, camera_x, player, enemies, bodies, combat):
+        self.level = level
+        self.tick = tick
+        self.time_ms = time_ms
+        self.camera_x = camera_x
+        self.player = player
+        self.enemies = enemies
+        self.bodies = bodies
+        self.combat = combat
+
+
+class SnapshotRing:
+    """The level-start checkpoint plus the last `size` snapshots, one every
+    `interval` ticks; older ones are overwritten."""
+    def __init__(self, size=SNAPSHOT_COUNT, interval=SNAPSHOT_INTERVAL):
+        self.interval = interval
+        self.slots = [None] * size
+        self.index = 0
+        self.count = 0
+        self.checkpoint = None
+
+    def __len__(self):
+        return self.count
+
+    def clear(self, checkpoint=None):
+        """Forget every snapshot; the checkpoint also starts the ring."""
+        self.slots = [None] * len(self.slots)
+        self.index = 0
+        self.count = 0
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            self.push(checkpoint)
+
+    def due(self, tick):
+        return tick % self.interval == 0
+
+    def push(self, snapshot):
+        self.slots[self.index] = snapshot
+        self.index = (self.index + 1) % len(self.slots)
+        self.count = min(self.count + 1, len(self.slots))
+
+    def latest(self):
+        return self.slots[self.index - 1] if self.count else None
+
+    def rewind(self, tick):
+        """The newest snapshot taken at or before `tick` (the oldest kept if
+        there is none); the ones after it are dropped."""
+        while self.count > 1 and self.latest().tick > tick:
+            self.index = (self.index - 1) % len(self.slots)
+            self.slots[self.index] = None
+            self.count -= 1
+        return self.latest()
@@ -0,0 +1,82 @@
+import pygame
+
+
+class SpatialHash:
+    """Uniform grid over world space for "what is near this rect?" queries.
+
+    Objects are stored in every cell their rect touches, so a query only looks
+    at the cells it covers instead of every object in the level.
+    """
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}  # obj -> (rect, cells)
+
+    def _cells_for(self, rect):
+        cs = self.cell_size
+        x0, y0 = rect.left // cs, rect.top // cs
+        x1, y1 = (rect.right - 1) // cs, (rect.bottom - 1) // cs
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def add(self, obj, rect):
+        if obj in self.entries:
+            self.move(obj, rect)
+            return
+        rect = pygame.Rect(rect)
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, {})[obj] = None
+        self.entries[obj] = (rect, cells)
+
+    def remove(self, obj):
+        entry = self.entries.pop(obj, None)
+        if entry is None:
+            return
+        for cell in entry[1]:
+            bucket = self.cells[cell]
+            del bucket[obj]
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, obj, rect):
+        entry = self.entries.get(obj)
+        if entry is None:
+            self.add(obj, rect)
+            return
+        old_rect, old_cells = entry
+        rect = pygame.Rect(rect)
+        cs = self.cell_size
+        # most moves stay inside the same cells
+        if (old_rect.left // cs == rect.left // cs and old_rect.top // cs == rect.top // cs
+                and (old_rect.right - 1) // cs == (rect.right - 1) // cs
+                and (old_rect.bottom - 1) // cs == (rect.bottom - 1) // cs):
+            self.entries[obj] = (rect, old_cells)
+            return
+        self.remove(obj)
+        self.add(obj, rect)
+
+    def query(self, rect):
+        """Objects whose rect overlaps the given rect, each returned once."""
+        rect = pygame.Rect(rect)
+        found = {}
+        for cell in self._cells_for(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return [obj for obj in found if self.entries[obj][0].colliderect(rect)]
+
+    def query_point(self, x, y):
+        return self.query((x, y, 1, 1))
+
+    def rect_of(self, obj):
+        return self.entries[obj][0]
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def __len__(self):
+        return len(self.entries)
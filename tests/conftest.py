@@ -0,0 +1,22 @@
+import os
+import sys
+
+# no window or audio device while testing
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# game modules live at the repo root and load assets by relative path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def display():
+    pygame.display.init()
+    screen = pygame.display.set_mode((64, 64))
+    yield screen
+    pygame.display.quit()
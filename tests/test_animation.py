@@ -0,0 +1,37 @@
+import pygame
+
+from animation import AnimationAtlas
+from player import Player
+
+
+def marked_sheet(frames=3):
+    """Sheet whose frames each have one red pixel in their top-left corner."""
+    sheet = pygame.Surface((100 * frames, 100), pygame.SRCALPHA)
+    for i in range(frames):
+        sheet.set_at((i * 100, 0), (255, 0, 0, 255))
+    return sheet
+
+
+def test_frames_are_sliced_once_per_sheet_and_scale():
+    atlas = AnimationAtlas()
+    sheet = marked_sheet()
+    frames = atlas.get(sheet, 2)
+    assert len(frames) == 3 and frames[0].get_size() == (200, 200)
+    assert atlas.get(sheet, 2) is frames
+    assert atlas.get(sheet, 1) is not frames
+
+
+def test_flipped_frames_mirror_the_unflipped_ones():
+    atlas = AnimationAtlas()
+    sheet = marked_sheet()
+    frames = atlas.get(sheet, 1)
+    flipped = atlas.get(sheet, 1, flipped=True)
+    assert atlas.get(sheet, 1, flipped=True) is flipped
+    assert frames[0].get_at((0, 0)) == flipped[0].get_at((99, 0)) == (255, 0, 0, 255)
+    assert flipped[0].get_at((0, 0)).a == 0
+
+
+def test_characters_share_their_frames():
+    first = Player(100, 400, 10, 1, 6, 3)
+    second = Player(600, 400, 10, 1, 6, 3)
+    assert first.frames is second.frames
@@ -0,0 +1,57 @@
+from combat import Combat, hitbox
+from enemy import Enemy
+from physics import PhysicsWorld
+from spatial import SpatialHash
+from player import Player
+
+
+def setup_fight(orc_dx=60):
+    physics = PhysicsWorld(ground_y=700, world_width=2000)
+    player = Player(500, 400, 10, 1, 6, 3)
+    orc = Enemy(500 + orc_dx, 400, 5, 1, 4, 3, target=player)
+    spatial = SpatialHash()
+    for fighter in (player, orc):
+        physics.add(fighter, fighter.body)
+        spatial.add(fighter, fighter.rect)
+    return (physics, spatial), player, orc
+
+
+def swing(player, frame=3):
+    player.set_state("idle")
+    player.set_state("attack")
+    player.attacking = True
+    player.current_frame = frame
+
+
+def test_hitbox_only_on_active_frames():
+    _, player, _ = setup_fight()
+    swing(player, frame=0)
+    assert hitbox(player) is None
+    player.current_frame = 3
+    assert hitbox(player) is not None
+
+
+def test_each_swing_hits_a_target_once():
+    world, player, orc = setup_fight()
+    combat = Combat()
+    swing(player)
+    assert combat.resolve([player, orc], *world) == [(player, orc)]
+    player.current_frame = 4
+    assert combat.resolve([player, orc], *world) == []
+    assert orc.health == 4
+
+    swing(player)
+    assert combat.resolve([player, orc], *world) == [(player, orc)]
+    assert orc.health == 3
+
+
+def test_no_hit_behind_or_out_of_reach():
+    world, player, orc = setup_fight()
+    player.side_left = True
+    swing(player)
+    assert Combat().resolve([player, orc], *world) == []
+
+    world, player, orc = setup_fight(orc_dx=250)
+    swing(player)
+    assert Combat().resolve([player, orc], *world) == []
+    assert orc.health == 5
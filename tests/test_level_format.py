@@ -0,0 +1,52 @@
+import json
+
+import pygame
+import pytest
+
+import level_format
+from level_format import LevelFile, compile_level, level_count
+from main import typed_digit
+
+
+def write_source(path, **data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_level_count_stops_at_the_first_gap(tmp_path, monkeypatch):
+    monkeypatch.setattr(level_format, "LEVEL_DIR", str(tmp_path))
+    for n in (1, 2, 4):
+        write_source(tmp_path / f"level{n}.json")
+    assert level_count() == 2
+
+
+def test_long_background_names_are_rejected(tmp_path):
+    src = write_source(tmp_path / "level1.json", backgrounds=[["x" * 61 + ".png", 0.5]])
+    with pytest.raises(ValueError):
+        compile_level(src, str(tmp_path / "level1.lvl"))
+
+
+@pytest.mark.parametrize("char, digit", [("1", 1), ("9", 9), ("0", None), ("²", None), ("a", None), ("", None)])
+def test_typed_digit(char, digit):
+    event = pygame.event.Event(pygame.KEYDOWN, key=0, unicode=char, mod=0, scancode=0)
+    assert typed_digit(event) == digit
+
+
+def test_compiled_level_reads_back(tmp_path):
+    src = write_source(tmp_path / "level1.json", world_width=1200,
+                       backgrounds=[["rear.png", 0.3], ["mid.png", 0.6]],
+                       platforms=[[100, 500, 200, 20], [450, 300, 200, 20]],
+                       spawns=[[800, 572]])
+    dst = str(tmp_path / "level1.lvl")
+    compile_level(src, dst, chunk_width=500)
+    level = LevelFile(dst)
+    try:
+        assert (level.world_width, level.chunk_width, level.chunk_count, level.top) == (1200, 500, 3, 300)
+        assert level.backgrounds == [("rear.png", pytest.approx(0.3)), ("mid.png", pytest.approx(0.6))]
+        assert level.spawns == [(800, 572)]
+        # the second platform crosses into chunk 1 and is stored in both
+        assert level.chunk_platforms(0) == [(100, 500, 200, 20), (450, 300, 200, 20)]
+        assert level.chunk_platforms(1) == [(450, 300, 200, 20)]
+        assert level.chunk_platforms(2) == [] and level.chunk_platforms(3) == []
+    finally:
+        level.close()
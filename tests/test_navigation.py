@@ -0,0 +1,10 @@
+import pygame
+
+from navigation import NavGraph
+
+
+def test_graph_only_covers_its_span():
+    nav = NavGraph(700, (1024, 2048), [pygame.Rect(1100, 600, 100, 20)], cell=32)
+    assert len(nav) == 1024 // 32 + 4
+    assert nav.locate([100], [700])[0] == -1  # ground left of the span
+    assert (nav.locate([1500, 1150], [700, 600]) >= 0).all()
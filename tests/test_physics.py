@@ -0,0 +1,56 @@
+import pygame
+
+from physics import PhysicsWorld
+
+
+class Body:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 20, 40)
+
+
+def test_bodies_keep_their_rows_through_growth_and_removal():
+    physics = PhysicsWorld(ground_y=700, world_width=2000)
+    bodies = [Body(i * 30, 100) for i in range(40)]
+    for body in bodies:
+        physics.add(body, pygame.Rect(0, 0, 20, 40))
+    for body in bodies[::3]:
+        physics.remove(body)
+    left = [body for i, body in enumerate(bodies) if i % 3]
+    assert len(physics) == len(physics.pos) == len(left)
+    for body in left:
+        assert physics.box(body).topleft == body.rect.topleft
+
+
+class Ledge:
+    def __init__(self, x, y, width):
+        self.rect = pygame.Rect(x, y, width, 20)
+
+
+def drop(physics, body, ticks=120):
+    for _ in range(ticks):
+        physics.step()
+    return physics.box(body)
+
+
+def test_fast_fall_lands_on_a_platform_top():
+    physics = PhysicsWorld(ground_y=700, world_width=2000)
+    physics.add_platform(Ledge(0, 400, 300))
+    body = Body(100, 0)
+    physics.add(body, pygame.Rect(0, 0, 20, 40))
+    physics.vel[physics.index[body], 1] = 200  # more than the platform's thickness per tick
+    assert drop(physics, body).bottom == 400
+    assert physics.grounded(body)
+
+
+def test_platforms_are_one_way():
+    physics = PhysicsWorld(ground_y=700, world_width=2000)
+    physics.add_platform(Ledge(0, 400, 300))
+    body = Body(100, 660)  # standing on the ground
+    physics.add(body, pygame.Rect(0, 0, 20, 40))
+    physics.step()
+    assert physics.grounded(body)
+    physics.drive(body, 0, jump_speed=-30)  # up through the platform from below
+    for _ in range(20):
+        physics.step()
+    assert physics.box(body).bottom < 400
+    assert drop(physics, body).bottom == 400
@@ -0,0 +1,23 @@
+import pygame
+import pytest
+
+from replay import _read_varint, _write_varint, decode, encode
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2 ** 32 + 5])
+def test_varint_round_trip(value):
+    out = bytearray()
+    _write_varint(out, value)
+    assert len(out) == max(1, (value.bit_length() + 6) // 7)
+    assert _read_varint(bytes(out) + b"\xff", 0) == (value, len(out))
+
+
+def test_encode_decode_round_trip():
+    press = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1, unicode="1", mod=0, scancode=0)
+    records = [(0, 0, [press]), (200, 5, []), (1000, 0, [pygame.event.Event(pygame.QUIT)])]
+    seed, ticks, decoded = decode(encode(1234, 1001, records))
+    assert (seed, ticks) == (1234, 1001)
+    assert [(tick, mask) for tick, mask, _ in decoded] == [(0, 0), (200, 5), (1000, 0)]
+    key = decoded[0][2][0]
+    assert (key.type, key.key, key.unicode) == (pygame.KEYDOWN, pygame.K_1, "1")
+    assert decoded[2][2][0].type == pygame.QUIT
@@ -0,0 +1,48 @@
+import pygame
+
+from enemy import Enemy
+from render_queue import RenderQueue
+from resolution import scaled
+
+
+class RecordingTarget:
+    """Stands in for the world target and keeps what flush() blits."""
+    def __init__(self, size=(768, 600)):
+        self.size = size
+        self.blitted = []
+
+    def get_size(self):
+        return self.size
+
+    def blits(self, sequence, doreturn=True):
+        self.blitted.extend(sequence)
+
+
+def test_scaled_copy_follows_alpha_changes():
+    surface = pygame.Surface((40, 20))
+    surface.set_alpha(200)
+    assert scaled(surface, 0.75).get_alpha() == 200
+    surface.set_alpha(50)
+    copy = scaled(surface, 0.75)
+    assert copy.get_alpha() == 50
+    assert copy.get_size() == (30, 15)
+
+
+def test_fading_enemy_blit_alpha_follows_its_image():
+    enemy = Enemy(100, 100, 1, 1, 1, 3, target=None)
+    enemy.take_damage(1)
+    enemy.update()  # switches to the death animation
+    while enemy.current_frame < len(enemy.frames):
+        enemy.update()
+
+    seen = []
+    for _ in range(5):
+        enemy.update()  # one fade step
+        queue = RenderQueue()
+        queue.add(enemy.image, enemy.rect.topleft)
+        target = RecordingTarget()
+        queue.flush(target, camera_x=0, scale=0.75)
+        (blitted, _), = target.blitted
+        assert blitted.get_alpha() == enemy.image.get_alpha()
+        seen.append(blitted.get_alpha())
+    assert seen == sorted(seen, reverse=True) and seen[0] > seen[-1]
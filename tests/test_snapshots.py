@@ -0,0 +1,42 @@
+from snapshots import SnapshotRing
+
+
+class Snap:
+    def __init__(self, tick):
+        self.tick = tick
+
+
+def filled(ticks, size=4):
+    ring = SnapshotRing(size=size, interval=30)
+    ring.clear(checkpoint=Snap(0))
+    for tick in ticks:
+        ring.push(Snap(tick))
+    return ring
+
+
+def test_checkpoint_starts_the_ring():
+    ring = filled([])
+    assert len(ring) == 1
+    assert ring.latest() is ring.checkpoint
+
+
+def test_oldest_snapshots_are_overwritten():
+    ring = filled([30, 60, 90, 120, 150])
+    assert len(ring) == 4
+    assert ring.latest().tick == 150
+    assert ring.rewind(-1).tick == 60  # nothing that old left, the oldest kept
+    assert ring.checkpoint.tick == 0
+
+
+def test_rewind_drops_newer_snapshots():
+    ring = filled([30, 60, 90])
+    assert ring.rewind(70).tick == 60
+    assert len(ring) == 3
+    ring.push(Snap(90))
+    assert ring.rewind(89).tick == 60
+    assert ring.rewind(0).tick == 0
+
+
+def test_due_every_interval():
+    ring = SnapshotRing(size=4, interval=30)
+    assert [t for t in range(1, 100) if ring.due(t)] == [30, 60, 90]
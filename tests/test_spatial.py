@@ -0,0 +1,21 @@
+from spatial import SpatialHash
+
+
+def test_query_finds_overlapping_objects_once():
+    grid = SpatialHash(cell_size=100)
+    grid.add("wide", (50, 50, 300, 20))  # spans several cells
+    grid.add("far", (1000, 1000, 10, 10))
+    assert grid.query((0, 0, 400, 400)) == ["wide"]
+    assert grid.query((360, 50, 10, 10)) == []  # shares a cell, not the rect
+
+
+def test_move_and_remove_update_the_cells():
+    grid = SpatialHash(cell_size=100)
+    grid.add("orc", (10, 10, 20, 20))
+    grid.move("orc", (20, 10, 20, 20))  # same cells
+    assert grid.rect_of("orc").x == 20
+    grid.move("orc", (510, 10, 20, 20))
+    assert grid.query((0, 0, 100, 100)) == []
+    assert grid.query_point(515, 15) == ["orc"]
+    grid.remove("orc")
+    assert len(grid) == 0 and not grid.cells
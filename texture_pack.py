@@ -0,0 +1,189 @@
+"""Baked texture pack.
+
+Decoding the PNG sheets, slicing and scaling frames and smoothscaling the
+backgrounds is done once at build time and written to a single file of raw
+pixels in the display's byte order:
+
+    header   magic, version, pixel format, entry count, index offset
+    pixels   raw frames, back to back per entry
+    index    (asset path, kind, flipped, scale or height, frame size,
+              frame count, offset, source mtime) per entry
+
+Character sheets are stored as frame lists, facing right and flipped;
+backgrounds as single images scaled to the screen height. The game
+memory-maps the pack and wraps the pixels in surfaces without decoding or
+copying. Entries whose source file changed after baking are ignored, so
+stale art falls back to normal loading.
+
+    python texture_pack.py          # bake assets/textures.pak
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import pygame
+from settings import *
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PACK_PATH = os.path.join(BASE_DIR, TEXTURE_PACK)
+MAGIC = b"PAK1"
+VERSION = 1
+CHARACTER_SCALE = 3  # scale the player and orcs are created with
+
+FRAMES, IMAGE = 0, 1
+
+HEADER = struct.Struct("<4sH4sIQ")  # magic, version, pixel format, entries, index offset
+ENTRY = struct.Struct("<120sBBdIIIQd")  # path, kind, flipped, scale/height, w, h, count, offset, mtime
+
+
+def asset_key(path):
+    """Pack name of an asset: path relative to the game folder."""
+    return os.path.relpath(os.path.abspath(path), BASE_DIR).replace(os.sep, "/")
+
+
+def display_pixel_format():
+    """Byte order that blits onto the display without conversion."""
+    surface = pygame.display.get_surface()
+    if surface is not None and surface.get_masks()[2] == 0xFF:
+        return "BGRA"
+    return "RGBA"
+
+
+# ----------------------------------------------------------------------
+def baked_assets():
+    """(path, kind, flipped, scale or height, surfaces) for everything the game loads."""
+    from animation import atlas
+    from assets import load_scaled_image
+    from enemy import animation_orc
+    from player import animation_soldier
+    from level import background_layer_files
+    from level_format import level_numbers, open_level
+
+    for sheets in (animation_soldier, animation_orc):
+        for path in sheets.values():
+            frames = atlas._slice(atlas.sheet(path), CHARACTER_SCALE)
+            yield path, FRAMES, False, CHARACTER_SCALE, frames
+            yield path, FRAMES, True, CHARACTER_SCALE, [pygame.transform.flip(f, True, False) for f in frames]
+
+    seen = set()
+    for n in level_numbers():
+        level_file = open_level(n)
+        for path, _ in background_layer_files(level_file.backgrounds):
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                image = load_scaled_image(path, SCREEN_HEIGHT)
+            except pygame.error as e:
+                print(f"skipped {asset_key(path)}:", e)
+                continue
+            yield path, IMAGE, False, SCREEN_HEIGHT, [image]
+        level_file.close()
+
+
+def bake(dst=PACK_PATH):
+    """Write the texture pack; returns the number of entries."""
+    pixel_format = display_pixel_format()
+    entries = []
+    tmp = dst + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, pixel_format.encode(), 0, 0))
+        for path, kind, flipped, size, surfaces in baked_assets():
+            width, height = surfaces[0].get_size()
+            offset = f.tell()
+            for surface in surfaces:
+                f.write(pygame.image.tobytes(surface, pixel_format))
+            entries.append(ENTRY.pack(asset_key(path).encode("utf-8"), kind, flipped, size,
+                                      width, height, len(surfaces), offset, os.path.getmtime(path)))
+        index = f.tell()
+        for entry in entries:
+            f.write(entry)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, pixel_format.encode(), len(entries), index))
+    os.replace(tmp, dst)
+    return len(entries)
+
+
+# ----------------------------------------------------------------------
+class TexturePack:
+    """Memory-mapped texture pack. Surfaces point straight into the mapping."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, pixel_format, count, index = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} texture pack")
+        self.pixel_format = pixel_format.decode()
+        self._index = {}
+        for i in range(count):
+            name, kind, flipped, size, w, h, n, offset, mtime = ENTRY.unpack_from(self._mmap, index + i * ENTRY.size)
+            key = (name.rstrip(b"\0").decode("utf-8"), kind, bool(flipped), size)
+            self._index[key] = (w, h, n, offset, mtime)
+
+    def _surfaces(self, path, kind, flipped, size):
+        entry = self._index.get((asset_key(path), kind, flipped, size))
+        if entry is None:
+            return None
+        w, h, n, offset, mtime = entry
+        try:
+            if os.path.getmtime(path) > mtime:
+                return None  # source changed since baking
+        except OSError:
+            pass
+        stride = w * h * 4
+        return [pygame.image.frombuffer(self._view[offset + i * stride:offset + (i + 1) * stride], (w, h), self.pixel_format)
+                for i in range(n)]
+
+    def frames(self, path, scale, flipped=False):
+        return self._surfaces(path, FRAMES, flipped, scale)
+
+    def image(self, path, height):
+        surfaces = self._surfaces(path, IMAGE, False, height)
+        return surfaces[0] if surfaces else None
+
+    def __len__(self):
+        return len(self._index)
+
+
+_pack = None
+_pack_opened = False
+_pack_lock = threading.Lock()
+
+
+def get_pack():
+    """The game's texture pack, opened on first use (None if it was not baked)."""
+    global _pack, _pack_opened
+    with _pack_lock:
+        if not _pack_opened:
+            _pack_opened = True
+            if os.path.isfile(PACK_PATH):
+                try:
+                    _pack = TexturePack(PACK_PATH)
+                except (OSError, ValueError) as e:
+                    print(f"Failed to open {TEXTURE_PACK}:", e)
+    return _pack
+
+
+def frames(path, scale, flipped=False):
+    """Baked frame list for a sprite sheet, or None."""
+    pack = get_pack()
+    return pack.frames(path, scale, flipped) if pack is not None else None
+
+
+def image(path, height):
+    """Baked background scaled to `height`, or None."""
+    pack = get_pack()
+    return pack.image(path, height) if pack is not None else None
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.chdir(BASE_DIR)
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    count = bake()
+    print(f"baked {count} entries into {TEXTURE_PACK} ({os.path.getsize(PACK_PATH) // 1024} KiB)")
+    sys.exit(0)
@@ -1,11 +1,76 @@
+from collections import OrderedDict
 import pygame
+from settings import TEXT_CACHE_SIZE
+from memory import memory
+
+_fonts = {}
+_text_cache = OrderedDict()
+
+
+def get_font(size, name=None):
+    """Fonts are created once and shared."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """font.render() through a bounded LRU cache, so the same string is only rasterised once."""
+    key = (font, text, tuple(color), antialias)
+    txt = _text_cache.get(key)
+    if txt is None:
+        txt = _text_cache[key] = memory.track(font.render(text, antialias, color), "ui")
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return txt
+
+
+def clear_text_cache(nbytes=None):
+    _text_cache.clear()
+
+
+memory.set_evictor("ui", clear_text_cache)
+
 
 def draw_text(surface, text, font, color, x, y, center=False):
     """Draw text on a surface (helper)."""
-    txt = font.render(text, True, color)
+    txt = render_text(font, text, color)
     rect = txt.get_rect()
     if center:
         rect.center = (x, y)
     else:
         rect.topleft = (x, y)
-    surface.blit(txt, rect)
\ No newline at end of file
+    surface.blit(txt, rect)
+
+
+def lerp(a, b, t):
+    """Linear interpolation between a and b."""
+    return a + (b - a) * t
+
+
+class NullSound:
+    """Silent stand-in used when the mixer is not initialised (headless runs)."""
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+    def get_volume(self):
+        return 0.0
+
+
+def load_sound(path, volume=1.0):
+    """Load a sound, or a NullSound when there is no audio."""
+    if not pygame.mixer.get_init():
+        return NullSound()
+    sound = pygame.mixer.Sound(path)
+    sound.set_volume(volume)
+    return sound